@@ -11,8 +11,100 @@ Descrição: Aqui configuramos como os modelos aparecem no admin
 =============================================================================
 """
 
+from datetime import datetime
+
 from django.contrib import admin
-from .models import Marca, Product, Client, Sale, SaleItem, AccountsReceivable, AccountsPayable
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ALL_VAR, ChangeList, ORDER_VAR, PAGE_VAR
+from django.contrib.postgres.search import SearchQuery
+from django.db import connection
+from django.db.models import Q
+from .models import Marca, Product, Client, Sale, SaleItem, AccountsReceivable, AccountsPayable, marcas_em_cache
+from .paginators import EstimatedCountPaginator
+
+
+def _is_changelist(request):
+    """
+    Indica se a requisição é para a listagem (changelist) do admin.
+    """
+    match = getattr(request, 'resolver_match', None)
+    return bool(match and match.url_name and match.url_name.endswith('_changelist'))
+
+
+# =============================================================================
+# CHANGELIST: paginação por cursor (keyset)
+# =============================================================================
+CURSOR_VAR = 'cursor'
+
+
+class CursorChangeList(ChangeList):
+    """
+    ChangeList para modelos ordenados por '-criado_em' que aceita o parâmetro
+    ?cursor=<criado_em>_<id>. Com o cursor, a listagem continua a partir do
+    último registro visto (WHERE (criado_em, id) < cursor) em vez de usar
+    OFFSET, que fica mais lento a cada página.
+    """
+
+    def get_filters_params(self, params=None):
+        lookup_params = super().get_filters_params(params)
+        # O cursor não é um filtro de campo do modelo
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        cursor = request.GET.get(CURSOR_VAR)
+        # O cursor só vale para a ordenação padrão
+        if not cursor or ORDER_VAR in self.params:
+            return qs
+        try:
+            criado_em, pk = cursor.rsplit('_', 1)
+            criado_em = datetime.fromisoformat(criado_em)
+            pk = int(pk)
+        except ValueError:
+            raise IncorrectLookupParameters('Cursor inválido')
+        return qs.filter(Q(criado_em__lt=criado_em) | Q(criado_em=criado_em, pk__lt=pk))
+
+    @property
+    def cursor_ativo(self):
+        """
+        Indica se a página atual foi aberta a partir de um cursor.
+        """
+        return bool(self.params.get(CURSOR_VAR)) and ORDER_VAR not in self.params
+
+    def get_query_string(self, new_params=None, remove=None):
+        """
+        Links de número de página e "mostrar todos" recomeçam do início da
+        listagem: o cursor é removido, senão o OFFSET seria aplicado depois
+        do cursor e registros seriam pulados.
+        """
+        if new_params and (PAGE_VAR in new_params or ALL_VAR in new_params):
+            remove = [*(remove or []), CURSOR_VAR]
+        return super().get_query_string(new_params, remove)
+
+    @property
+    def url_primeira_pagina(self):
+        """
+        Query string da primeira página (sem cursor, mantém os filtros).
+        """
+        return self.get_query_string(remove=[CURSOR_VAR, PAGE_VAR])
+
+    @property
+    def url_proxima_pagina(self):
+        """
+        Query string da próxima página usando o cursor do último registro da
+        página atual (mantém os filtros), ou None se não houver próxima página.
+        """
+        if ORDER_VAR in self.params or self.show_all or not self.multi_page:
+            return None
+        if self.page_num >= self.paginator.num_pages:
+            return None
+        objetos = list(self.result_list)
+        if not objetos:
+            return None
+        ultimo = objetos[-1]
+        cursor = f'{ultimo.criado_em.isoformat()}_{ultimo.pk}'
+        return self.get_query_string({CURSOR_VAR: cursor}, [PAGE_VAR])
 
 
 # =============================================================================
@@ -38,6 +130,7 @@ class ProductAdmin(admin.ModelAdmin):
     """
     list_display = ['nome', 'usuario', 'marca', 'preco', 'estoque', 'ativo', 'criado_em']
     list_filter = ['ativo', 'marca', 'usuario', 'criado_em']
+    list_select_related = ('marca', 'usuario')
     search_fields = ['nome', 'descricao']
     readonly_fields = ['criado_em', 'atualizado_em']
     fieldsets = (
@@ -55,6 +148,34 @@ class ProductAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        """
+        Usa a listagem com paginação por cursor.
+        """
+        return CursorChangeList
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """
+        Monta as opções de marca a partir do cache, sem consultar a tabela
+        de marcas a cada formulário.
+        """
+        formfield = super().formfield_for_foreignkey(db_field, request, **kwargs)
+        if db_field.name == 'marca':
+            formfield.choices = [('', formfield.empty_label)] + [
+                (marca.pk, str(marca)) for marca in marcas_em_cache()
+            ]
+        return formfield
+
+    def get_queryset(self, request):
+        """
+        Não carrega a descrição (TextField) na listagem, pois ela não é exibida.
+        No formulário de edição ela é usada e vem na mesma consulta.
+        """
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer('descricao')
+        return qs
+
 
 # =============================================================================
 # ADMIN: Client
@@ -66,6 +187,7 @@ class ClientAdmin(admin.ModelAdmin):
     """
     list_display = ['nome', 'usuario', 'email', 'telefone', 'ativo', 'criado_em']
     list_filter = ['ativo', 'usuario', 'criado_em']
+    list_select_related = ('usuario',)
     search_fields = ['nome', 'email', 'telefone', 'cpf_cnpj']
     readonly_fields = ['criado_em', 'atualizado_em']
     fieldsets = (
@@ -83,6 +205,12 @@ class ClientAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_changelist(self, request, **kwargs):
+        """
+        Usa a listagem com paginação por cursor.
+        """
+        return CursorChangeList
+
 
 # =============================================================================
 # ADMIN: SaleItem (Inline)
@@ -92,9 +220,34 @@ class SaleItemInline(admin.TabularInline):
     Configuração inline para editar itens de venda dentro da venda.
     """
     model = SaleItem
-    extra = 1
+    extra = 0
     readonly_fields = ['subtotal']
     fields = ['produto', 'quantidade', 'preco_unitario', 'subtotal']
+    # Produto por busca (autocomplete): o select não lista todos os produtos
+    # em cada linha do inline
+    autocomplete_fields = ['produto']
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        """
+        O widget de autocomplete busca o produto selecionado de cada linha;
+        a marca (usada no nome exibido) vem na mesma consulta.
+        """
+        if db_field.name == 'produto':
+            kwargs['queryset'] = Product.objects.select_related('marca')
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_queryset(self, request):
+        """
+        Carrega o produto (e sua marca) junto com os itens, evitando
+        uma consulta extra por linha ao exibir o inline. Do produto e da
+        marca só são lidos os nomes, usados na exibição.
+        """
+        return super().get_queryset(request).select_related(
+            'produto', 'produto__marca'
+        ).only(
+            'venda', 'quantidade', 'preco_unitario', 'subtotal',
+            'produto__nome', 'produto__marca__nome'
+        )
 
 
 # =============================================================================
@@ -107,6 +260,10 @@ class SaleAdmin(admin.ModelAdmin):
     """
     list_display = ['id', 'usuario', 'cliente', 'valor_total', 'forma_pagamento', 'data_vencimento', 'data_venda']
     list_filter = ['usuario', 'forma_pagamento', 'data_venda']
+    list_select_related = ('cliente', 'usuario')
+    paginator = EstimatedCountPaginator
+    # Sem o "X de Y" nas buscas: evita o COUNT(*) da tabela inteira
+    show_full_result_count = False
     search_fields = ['cliente__nome', 'observacoes']
     readonly_fields = ['data_venda', 'criado_em', 'atualizado_em', 'valor_total']
     inlines = [SaleItemInline]
@@ -128,6 +285,29 @@ class SaleAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """
+        Na listagem carrega apenas as colunas exibidas (e os nomes de cliente
+        e usuário); nas demais telas só deixa de fora o vetor de busca.
+        """
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.select_related('cliente', 'usuario').only(
+                'id', 'usuario__username', 'cliente__nome', 'valor_total',
+                'forma_pagamento', 'data_vencimento', 'data_venda'
+            )
+        return qs.defer('search_vector')
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        No PostgreSQL usa a busca textual (search_vector + índice GIN) em vez
+        de LIKE com JOIN em cliente; nos demais bancos mantém a busca padrão.
+        """
+        if not search_term or connection.vendor != 'postgresql':
+            return super().get_search_results(request, queryset, search_term)
+        consulta = SearchQuery(search_term, config='portuguese')
+        return queryset.filter(search_vector=consulta), False
+
 
 # =============================================================================
 # ADMIN: AccountsReceivable
@@ -139,6 +319,10 @@ class AccountsReceivableAdmin(admin.ModelAdmin):
     """
     list_display = ['id', 'usuario', 'cliente', 'valor', 'data_vencimento', 'status', 'criado_em']
     list_filter = ['usuario', 'status', 'data_vencimento']
+    list_select_related = ('cliente', 'usuario', 'venda')
+    paginator = EstimatedCountPaginator
+    # Sem o "X de Y" nas buscas: evita o COUNT(*) da tabela inteira
+    show_full_result_count = False
     search_fields = ['cliente__nome', 'observacoes']
     readonly_fields = ['criado_em', 'venda']
     fieldsets = (
@@ -162,6 +346,17 @@ class AccountsReceivableAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """
+        Não carrega as observações (da conta e da venda) na listagem,
+        pois não são exibidas. No formulário de edição elas são usadas e
+        vêm na mesma consulta.
+        """
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer('observacoes', 'venda__observacoes', 'venda__search_vector')
+        return qs
+
 
 # =============================================================================
 # ADMIN: AccountsPayable
@@ -173,7 +368,11 @@ class AccountsPayableAdmin(admin.ModelAdmin):
     """
     list_display = ['id', 'usuario', 'descricao', 'valor', 'data_vencimento', 'status', 'criado_em']
     list_filter = ['usuario', 'status', 'data_vencimento']
+    list_select_related = ('usuario',)
     search_fields = ['descricao', 'observacoes']
+    paginator = EstimatedCountPaginator
+    # Sem o "X de Y" nas buscas: evita o COUNT(*) da tabela inteira
+    show_full_result_count = False
     readonly_fields = ['criado_em']
     fieldsets = (
         ('Informações Básicas', {
@@ -194,4 +393,14 @@ class AccountsPayableAdmin(admin.ModelAdmin):
         ('Data de Criação', {
             'fields': ('criado_em',)
         }),
-    )
\ No newline at end of file
+    )
+
+    def get_queryset(self, request):
+        """
+        Não carrega as observações (TextField) na listagem, pois não são exibidas.
+        No formulário de edição elas são usadas e vêm na mesma consulta.
+        """
+        qs = super().get_queryset(request)
+        if _is_changelist(request):
+            return qs.defer('observacoes')
+        return qs
@@ -0,0 +1,82 @@
+"""
+=============================================================================
+ARQUIVO: vendas/backends.py
+=============================================================================
+Objetivo: Backends de autenticação da aplicação
+Descrição: Aqui permitimos o login pelo email (sem diferenciar maiúsculas
+           de minúsculas) com uma única consulta ao banco
+=============================================================================
+"""
+
+import functools
+import secrets
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+
+from .cache import USUARIO_EMAIL_TIMEOUT, chave_usuario_email
+
+
+@functools.lru_cache(maxsize=1)
+def hash_senha_ficticia():
+    """
+    Hash de uma senha aleatória, gerado uma vez por processo com o hasher
+    padrão. Serve para conferir a senha quando o email não existe, com o
+    mesmo custo de um usuário real.
+    """
+    return make_password(secrets.token_urlsafe(16))
+
+
+def usuario_por_email(email):
+    """
+    Retorna o usuário com o email informado (sem diferenciar maiúsculas de
+    minúsculas), ou None. Só o pk do usuário fica em cache (nunca o objeto
+    com o hash da senha) por alguns segundos; o usuário é sempre carregado
+    do banco pelo pk. A chave é invalidada quando o usuário é alterado
+    (vendas/signals.py).
+    """
+    usuarios = get_user_model()._default_manager
+    chave = chave_usuario_email(email)
+    usuario_id = cache.get(chave)
+    if usuario_id is not None:
+        # O filtro pelo email protege contra uma chave que ficou para trás
+        usuario = usuarios.filter(pk=usuario_id, email__iexact=email).first()
+        if usuario is not None:
+            return usuario
+        cache.delete(chave)
+
+    usuario = usuarios.filter(email__iexact=email).order_by('pk').first()
+    if usuario is not None:
+        cache.set(chave, usuario.pk, USUARIO_EMAIL_TIMEOUT)
+    return usuario
+
+
+# =============================================================================
+# BACKEND: EmailBackend
+# =============================================================================
+class EmailBackend(ModelBackend):
+    """
+    Autentica o usuário pelo email e senha.
+    Uso: authenticate(request, email=email, password=senha)
+
+    Chamadas com username (ex.: login do admin) são ignoradas aqui e
+    tratadas pelo ModelBackend padrão.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+
+        usuario = usuario_por_email(email)
+        if usuario is None:
+            # Confere a senha contra um hash fictício, percorrendo o mesmo
+            # caminho (hash + comparação em tempo constante) de um usuário
+            # real, para que o tempo de resposta não revele se o email existe
+            check_password(password, hash_senha_ficticia())
+            return None
+
+        if usuario.check_password(password) and self.user_can_authenticate(usuario):
+            return usuario
+        return None
@@ -0,0 +1,99 @@
+"""
+=============================================================================
+ARQUIVO: vendas/cache.py
+=============================================================================
+Objetivo: Funções auxiliares de cache da aplicação
+Descrição: Aqui controlamos a versão do cache do dashboard de cada usuário
+           (sempre que os dados do usuário mudam a versão é trocada, e as
+           entradas antigas deixam de ser usadas e expiram sozinhas), o
+           cache da busca de usuário por email usada no login e as listas
+           de marcas e de clientes ativos.
+=============================================================================
+"""
+
+import uuid
+
+from django.core.cache import cache
+
+
+# Tempo (segundos) que o resumo do dashboard fica em cache
+DASHBOARD_TIMEOUT = 300
+
+# Tempo (segundos) que o pk do usuário buscado por email fica em cache
+USUARIO_EMAIL_TIMEOUT = 60
+
+# Tempo (segundos) que a lista de marcas fica em cache
+MARCAS_TIMEOUT = 3600
+
+# Tempo (segundos) que a lista de clientes ativos de um usuário fica em cache
+CLIENTES_ATIVOS_TIMEOUT = 300
+
+CHAVE_MARCAS = 'marcas:todas'
+
+
+def _chave_versao_dashboard(usuario_id):
+    return f'dashboard:versao:{usuario_id}'
+
+
+def versao_dashboard(usuario_id):
+    """
+    Retorna a versão atual do cache do dashboard do usuário.
+    """
+    chave = _chave_versao_dashboard(usuario_id)
+    versao = cache.get(chave)
+    if versao is None:
+        versao = uuid.uuid4().hex
+        cache.set(chave, versao, None)
+    return versao
+
+
+def chave_dashboard(usuario_id, hoje):
+    """
+    Monta a chave do resumo do dashboard do usuário para o dia informado.
+    """
+    return f'dashboard:{usuario_id}:{versao_dashboard(usuario_id)}:{hoje.isoformat()}'
+
+
+def invalidar_dashboard(*usuarios_ids):
+    """
+    Troca a versão do cache do dashboard dos usuários informados.
+    """
+    for usuario_id in usuarios_ids:
+        cache.set(_chave_versao_dashboard(usuario_id), uuid.uuid4().hex, None)
+
+
+def invalidar_marcas():
+    """
+    Remove a lista de marcas do cache.
+    """
+    cache.delete(CHAVE_MARCAS)
+
+
+def chave_clientes_ativos(usuario_id):
+    """
+    Monta a chave da lista de clientes ativos do usuário (usada nos
+    filtros e formulários).
+    """
+    return f'clientes:ativos:{usuario_id}'
+
+
+def invalidar_clientes_ativos(*usuarios_ids):
+    """
+    Remove do cache a lista de clientes ativos dos usuários informados.
+    """
+    cache.delete_many([chave_clientes_ativos(usuario_id) for usuario_id in usuarios_ids])
+
+
+def chave_usuario_email(email):
+    """
+    Monta a chave do cache do usuário buscado pelo email (sem diferenciar
+    maiúsculas de minúsculas).
+    """
+    return f'usuario:email:{email.strip().lower()}'
+
+
+def invalidar_usuario_email(*emails):
+    """
+    Remove do cache os usuários buscados pelos emails informados.
+    """
+    cache.delete_many([chave_usuario_email(email) for email in emails if email])
@@ -0,0 +1,86 @@
+"""
+=============================================================================
+ARQUIVO: vendas/forms.py
+=============================================================================
+Objetivo: Formulários de validação dos dados enviados pelas páginas
+Descrição: Aqui lemos e convertemos os campos do POST de uma só vez, com as
+           mesmas mensagens de erro exibidas pelas views
+=============================================================================
+"""
+
+from django import forms
+
+from .models import buscar_marca_em_cache
+
+
+class DecimalComVirgulaField(forms.DecimalField):
+    """
+    Campo decimal que aceita vírgula como separador (ex.: 10,50).
+    """
+
+    def to_python(self, value):
+        if isinstance(value, str):
+            value = value.strip().replace(',', '.')
+        return super().to_python(value)
+
+
+class FormularioBase(forms.Form):
+    """
+    Formulário com o atalho para a primeira mensagem de erro, exibida pelas
+    views com messages.error.
+    """
+
+    def primeiro_erro(self):
+        for erros in self.errors.values():
+            return erros[0]
+        return ''
+
+
+# =============================================================================
+# FORMULÁRIO: Produto
+# =============================================================================
+class ProdutoForm(FormularioBase):
+    """
+    Campos do cadastro/edição de produto.
+    A marca é buscada no cache de marcas (sem consulta ao banco).
+    """
+
+    nome = forms.CharField(
+        max_length=200,
+        error_messages={'required': 'Nome do produto é obrigatório!'}
+    )
+    # Mesmos limites de Product.preco (max_digits=10, decimal_places=2)
+    preco = DecimalComVirgulaField(
+        min_value=0,
+        max_digits=10,
+        decimal_places=2,
+        error_messages={
+            'required': 'Preço do produto é obrigatório!',
+            'invalid': 'Preço e estoque devem ser números válidos!',
+            'min_value': 'Preço não pode ser negativo!',
+            'max_digits': 'Preço muito alto!',
+            'max_whole_digits': 'Preço muito alto!',
+            'max_decimal_places': 'Preço deve ter no máximo 2 casas decimais!',
+        }
+    )
+    estoque = forms.IntegerField(
+        required=False,
+        min_value=0,
+        error_messages={
+            'invalid': 'Preço e estoque devem ser números válidos!',
+            'min_value': 'Estoque não pode ser negativo!',
+        }
+    )
+    descricao = forms.CharField(required=False)
+    marca = forms.CharField(required=False)
+    ativo = forms.BooleanField(required=False)
+
+    def clean_estoque(self):
+        return self.cleaned_data['estoque'] or 0
+
+    def clean_descricao(self):
+        return self.cleaned_data['descricao'] or None
+
+    def clean_marca(self):
+        marca_id = self.cleaned_data['marca']
+        return buscar_marca_em_cache(marca_id) if marca_id else None
@@ -0,0 +1,32 @@
+"""
+=============================================================================
+ARQUIVO: vendas/management/commands/atualizar_status_contas.py
+=============================================================================
+Objetivo: Comando para atualizar o status (pendente/vencido) das contas
+Descrição: Execute diariamente com: python manage.py atualizar_status_contas
+=============================================================================
+"""
+
+from django.core.management.base import BaseCommand
+from vendas.models import AccountsReceivable, AccountsPayable
+
+
+class Command(BaseCommand):
+    """
+    Comando para atualizar o status das contas a receber e a pagar.
+    """
+    help = 'Atualiza o status (pendente/vencido) das contas a receber e a pagar'
+
+    def handle(self, *args, **options):
+        """
+        Executa o comando.
+        """
+        receber = AccountsReceivable.atualizar_status_em_lote()
+        pagar = AccountsPayable.atualizar_status_em_lote()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {receber} conta(s) a receber atualizada(s)')
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ {pagar} conta(s) a pagar atualizada(s)')
+        )
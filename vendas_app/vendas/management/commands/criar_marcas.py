@@ -8,6 +8,9 @@ Descrição: Execute com: python manage.py criar_marcas
 """
 
 from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+from vendas.cache import invalidar_marcas
 from vendas.models import Marca
 
 
@@ -28,9 +31,25 @@ class Command(BaseCommand):
             'Avon'
         ]
 
+        # Um único INSERT ... ON CONFLICT DO NOTHING RETURNING: as duplicadas
+        # são ignoradas pela restrição unique e o RETURNING informa quais
+        # marcas foram realmente criadas
+        tabela = connection.ops.quote_name(Marca._meta.db_table)
+        valores = ', '.join(['(%s, %s)'] * len(marcas))
+        agora = timezone.now()
+        parametros = [valor for nome_marca in marcas for valor in (nome_marca, agora)]
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {tabela} (nome, criada_em) VALUES {valores} '
+                f'ON CONFLICT (nome) DO NOTHING RETURNING nome',
+                parametros
+            )
+            criadas = {linha[0] for linha in cursor.fetchall()}
+        # O INSERT direto não dispara signals, então o cache é limpo aqui
+        invalidar_marcas()
+
         for nome_marca in marcas:
-            marca, criada = Marca.objects.get_or_create(nome=nome_marca)
-            if criada:
+            if nome_marca in criadas:
                 self.stdout.write(
                     self.style.SUCCESS(f'✓ Marca "{nome_marca}" criada com sucesso')
                 )
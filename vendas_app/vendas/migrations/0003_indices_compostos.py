@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0002_alter_accountsreceivable_venda'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='accountspayable',
+            index=models.Index(fields=['usuario', 'status', 'data_vencimento'], name='vendas_acco_usuario_055a93_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='accountsreceivable',
+            index=models.Index(fields=['usuario', 'status', 'data_vencimento'], name='vendas_acco_usuario_ae92e0_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['usuario', '-criado_em'], name='vendas_clie_usuario_cd3b1c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['usuario', 'ativo'], name='vendas_clie_usuario_f491d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['usuario', '-criado_em'], name='vendas_prod_usuario_599c48_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['usuario', 'ativo'], name='vendas_prod_usuario_1a2fa9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['usuario', '-data_venda'], name='vendas_sale_usuario_9deec8_idx'),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Índices trigram (pg_trgm) para as buscas com icontains.
+#
+# No PostgreSQL o icontains do Django gera UPPER(coluna) LIKE UPPER('%termo%'),
+# por isso os índices são criados sobre UPPER(coluna). Em outros bancos
+# (ex.: SQLite em desenvolvimento) a migração não faz nada.
+
+from django.db import migrations
+
+
+INDICES_TRIGRAM = [
+    ('vendas_client_nome_trgm', 'vendas_client', 'nome'),
+    ('vendas_product_nome_trgm', 'vendas_product', 'nome'),
+    ('vendas_product_descricao_trgm', 'vendas_product', 'descricao'),
+    ('vendas_accountspayable_descricao_trgm', 'vendas_accountspayable', 'descricao'),
+]
+
+
+def criar_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for nome, tabela, coluna in INDICES_TRIGRAM:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{nome}" ON "{tabela}" '
+            f'USING gin (UPPER("{coluna}") gin_trgm_ops)'
+        )
+
+
+def remover_indices_trigram(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nome, tabela, coluna in INDICES_TRIGRAM:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{nome}"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0003_indices_compostos'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices_trigram, remover_indices_trigram),
+    ]
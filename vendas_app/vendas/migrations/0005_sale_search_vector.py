@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:04
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def criar_indice_busca(apps, schema_editor):
+    # Índice GIN e carga inicial do vetor de busca (somente PostgreSQL)
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS "vendas_sale_search_vector_gin" '
+        'ON "vendas_sale" USING gin ("search_vector")'
+    )
+    schema_editor.execute(
+        "UPDATE vendas_sale SET search_vector = to_tsvector('portuguese', "
+        "coalesce(vendas_client.nome, '') || ' ' || coalesce(vendas_sale.observacoes, '')) "
+        "FROM vendas_client WHERE vendas_client.id = vendas_sale.cliente_id"
+    )
+
+
+def remover_indice_busca(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS "vendas_sale_search_vector_gin"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0004_indices_trigram'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='sale',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Texto de busca (nome do cliente + observações), usado no PostgreSQL', null=True),
+        ),
+        migrations.RunPython(criar_indice_busca, remover_indice_busca),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0005_sale_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='client',
+            name='vendas_clie_usuario_f491d1_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='product',
+            name='vendas_prod_usuario_1a2fa9_idx',
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['usuario', 'ativo', '-criado_em'], name='vendas_clie_usuario_f234ab_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['usuario', 'ativo', '-criado_em'], name='vendas_prod_usuario_ad36cc_idx'),
+        ),
+    ]
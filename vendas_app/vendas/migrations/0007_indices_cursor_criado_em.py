@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0006_indices_usuario_ativo_criado'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-criado_em', '-id'], name='vendas_clie_criado__1b7fa1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-criado_em', '-id'], name='vendas_prod_criado__df5cd9_idx'),
+        ),
+    ]
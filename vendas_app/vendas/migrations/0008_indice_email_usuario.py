@@ -0,0 +1,39 @@
+# Índice para o login por email sem diferenciar maiúsculas/minúsculas
+# (email__iexact em vendas.backends.EmailBackend).
+#
+# No PostgreSQL o iexact gera UPPER(email) = UPPER('...'), por isso o índice
+# é sobre UPPER(email). No SQLite o iexact gera email LIKE '...', que usa
+# um índice com COLLATE NOCASE.
+
+from django.db import migrations
+
+
+def criar_indice_email(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "vendas_auth_user_email_ci" '
+            'ON "auth_user" (UPPER("email"))'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS "vendas_auth_user_email_ci" '
+            'ON "auth_user" ("email" COLLATE NOCASE)'
+        )
+
+
+def remover_indice_email(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute('DROP INDEX IF EXISTS "vendas_auth_user_email_ci"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('vendas', '0007_indices_cursor_criado_em'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indice_email, remover_indice_email),
+    ]
@@ -0,0 +1,74 @@
+# Email único sem diferenciar maiúsculas/minúsculas no auth_user.
+#
+# O registro grava o email já em minúsculas e deixa o banco recusar
+# duplicados (IntegrityError), sem a consulta exists() antes do INSERT.
+# O auth.User não é um modelo deste app, então a restrição não pode ir
+# no Meta; criamos um índice único equivalente a
+# UniqueConstraint(Lower('email')), ignorando emails vazios (ex.: usuários
+# criados pelo createsuperuser sem email).
+#
+# Ordem das operações:
+#   1. verifica duplicados (ex.: "Ana@x.com" e "ana@x.com") e aborta com a
+#      lista dos emails ANTES de alterar qualquer registro; os usuários
+#      duplicados precisam ser corrigidos manualmente;
+#   2. normaliza os emails existentes para minúsculas. É uma migração de
+#      dados sem volta: o reverse não restaura a grafia original;
+#   3. cria o índice único. O reverse só remove o índice.
+
+from django.db import migrations
+
+
+def verificar_emails_duplicados(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT LOWER("email") FROM "auth_user" WHERE "email" <> \'\' '
+            'GROUP BY LOWER("email") HAVING COUNT(*) > 1 ORDER BY 1'
+        )
+        duplicados = [linha[0] for linha in cursor.fetchall()]
+    if duplicados:
+        raise RuntimeError(
+            'Não é possível criar o índice de email único: existem usuários '
+            'com o mesmo email (sem diferenciar maiúsculas/minúsculas): '
+            + ', '.join(duplicados)
+            + '. Corrija esses usuários e rode a migração novamente. '
+            'Nenhum registro foi alterado.'
+        )
+
+
+def normalizar_emails(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    schema_editor.execute(
+        'UPDATE "auth_user" SET "email" = LOWER("email") '
+        'WHERE "email" <> LOWER("email")'
+    )
+
+
+def criar_indice_email_unico(apps, schema_editor):
+    if schema_editor.connection.vendor not in ('postgresql', 'sqlite'):
+        return
+    schema_editor.execute(
+        'CREATE UNIQUE INDEX IF NOT EXISTS "auth_user_email_ci_unique" '
+        'ON "auth_user" (LOWER("email")) WHERE "email" <> \'\''
+    )
+
+
+def remover_indice_email_unico(apps, schema_editor):
+    if schema_editor.connection.vendor in ('postgresql', 'sqlite'):
+        schema_editor.execute('DROP INDEX IF EXISTS "auth_user_email_ci_unique"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0008_indice_email_usuario'),
+    ]
+
+    operations = [
+        migrations.RunPython(verificar_emails_duplicados, migrations.RunPython.noop),
+        # Sem volta: a grafia original dos emails não é guardada
+        migrations.RunPython(normalizar_emails, migrations.RunPython.noop),
+        migrations.RunPython(criar_indice_email_unico, remover_indice_email_unico),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 06:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendas', '0009_email_usuario_unico'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='sale',
+            index=models.Index(fields=['usuario', 'cliente', '-data_venda'], name='vendas_sale_usuario_dd3e9b_idx'),
+        ),
+    ]
@@ -11,10 +11,18 @@ Descrição: Aqui criamos a estrutura de dados da aplicação com isolamento
 =============================================================================
 """
 
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Sum
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 from django.utils import timezone
 from datetime import timedelta
+from django.core.cache import cache
+
+from .cache import (
+    CHAVE_MARCAS, CLIENTES_ATIVOS_TIMEOUT, MARCAS_TIMEOUT,
+    chave_clientes_ativos, invalidar_dashboard,
+)
 
 
 # =============================================================================
@@ -44,6 +52,40 @@ class Marca(models.Model):
         return self.nome
 
 
+def marcas_em_cache():
+    """
+    Retorna todas as marcas, mantidas no cache do Django (compartilhado
+    entre os processos quando há Redis). As marcas mudam raramente; o cache
+    é limpo pelos signals de Marca (vendas/signals.py) e pelo comando
+    criar_marcas.
+    """
+    return cache.get_or_set(CHAVE_MARCAS, lambda: tuple(Marca.objects.all()), MARCAS_TIMEOUT)
+
+
+def clientes_ativos_em_cache(usuario_id):
+    """
+    Retorna os clientes ativos do usuário (apenas id e nome), usados nos
+    filtros e no formulário de venda. O cache é limpo pelos signals de
+    Client (vendas/signals.py).
+    """
+    return cache.get_or_set(
+        chave_clientes_ativos(usuario_id),
+        lambda: tuple(Client.objects.filter(usuario_id=usuario_id, ativo=True).only('id', 'nome')),
+        CLIENTES_ATIVOS_TIMEOUT
+    )
+
+
+def buscar_marca_em_cache(marca_id):
+    """
+    Retorna a marca com o ID informado (int ou str) usando o cache,
+    ou None se não existir.
+    """
+    for marca in marcas_em_cache():
+        if str(marca.id) == str(marca_id):
+            return marca
+    return None
+
+
 # =============================================================================
 # MODELO: Product
 # =============================================================================
@@ -108,6 +150,13 @@ class Product(models.Model):
         ordering = ['-criado_em']
         # Garante que cada usuário não pode ter dois produtos com o mesmo nome
         unique_together = ('usuario', 'nome')
+        # Índices para os filtros e a ordenação por usuário
+        indexes = [
+            models.Index(fields=['usuario', '-criado_em']),
+            models.Index(fields=['usuario', 'ativo', '-criado_em']),
+            # Paginação por cursor (criado_em, id) no admin
+            models.Index(fields=['-criado_em', '-id']),
+        ]
 
     def __str__(self):
         return f"{self.nome} - {self.marca}"
@@ -199,11 +248,53 @@ class Client(models.Model):
         ordering = ['-criado_em']
         # Garante que cada usuário não pode ter dois clientes com o mesmo nome
         unique_together = ('usuario', 'nome')
+        # Índices para os filtros e a ordenação por usuário
+        indexes = [
+            models.Index(fields=['usuario', '-criado_em']),
+            models.Index(fields=['usuario', 'ativo', '-criado_em']),
+            # Paginação por cursor (criado_em, id) no admin
+            models.Index(fields=['-criado_em', '-id']),
+        ]
 
     def __str__(self):
         return self.nome
 
 
+# =============================================================================
+# MANAGER: Sale
+# =============================================================================
+class SaleManager(models.Manager):
+    """
+    Manager das vendas.
+    """
+
+    def excluir_em_lote(self, vendas):
+        """
+        Exclui as vendas informadas (e seus itens e contas a receber) com
+        DELETEs diretos, sem o Collector do Django, que carrega cada registro
+        relacionado antes de excluir. Indicado para arquivamento/limpeza de
+        muitas vendas; não dispara signals de delete.
+
+        As chaves estrangeiras criadas pelo Django não têm ON DELETE CASCADE
+        no banco, por isso os registros dependentes são excluídos primeiro.
+
+        Args:
+            vendas: QuerySet de Sale a excluir
+
+        Returns:
+            Quantidade de vendas excluídas
+        """
+        db = vendas.db
+        ids = vendas.values('pk')
+        usuarios_ids = set(vendas.values_list('usuario_id', flat=True))
+        with transaction.atomic(using=db):
+            SaleItem.objects.using(db).filter(venda__in=ids)._raw_delete(using=db)
+            AccountsReceivable.objects.using(db).filter(venda__in=ids)._raw_delete(using=db)
+            excluidas = self.using(db).filter(pk__in=ids)._raw_delete(using=db)
+        invalidar_dashboard(*usuarios_ids)
+        return excluidas
+
+
 # =============================================================================
 # MODELO: Sale
 # =============================================================================
@@ -220,6 +311,7 @@ class Sale(models.Model):
         forma_pagamento (str): Forma de pagamento (Dinheiro, Cartão, Boleto, etc)
         data_vencimento (date): Data de vencimento do pagamento
         observacoes (str): Observações sobre a venda
+        search_vector (tsvector): Vetor de busca textual (somente PostgreSQL)
         criado_em (datetime): Data de criação
         atualizado_em (datetime): Data da última atualização
     """
@@ -269,13 +361,26 @@ class Sale(models.Model):
         null=True,
         help_text="Observações sobre a venda"
     )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Texto de busca (nome do cliente + observações), usado no PostgreSQL"
+    )
     criado_em = models.DateTimeField(auto_now_add=True)
     atualizado_em = models.DateTimeField(auto_now=True)
 
+    objects = SaleManager()
+
     class Meta:
         verbose_name = "Venda"
         verbose_name_plural = "Vendas"
         ordering = ['-data_venda']
+        # Índices para a listagem de vendas por usuário (e filtrada por
+        # cliente, também usada no detalhe do cliente)
+        indexes = [
+            models.Index(fields=['usuario', '-data_venda']),
+            models.Index(fields=['usuario', 'cliente', '-data_venda']),
+        ]
 
     def __str__(self):
         return f"Venda #{self.id} - {self.cliente.nome} - R$ {self.valor_total}"
@@ -283,13 +388,36 @@ class Sale(models.Model):
     def calcular_valor_total(self):
         """
         Calcula o valor total da venda somando todos os itens.
+
+        A soma é feita no banco (aggregate) e gravada com um único UPDATE,
+        sem passar pelo save() completo do modelo. Ao inserir vários itens
+        de uma vez (bulk_create), basta chamar este método uma vez no final.
         """
-        total = sum(item.subtotal for item in self.itens.all())
+        total = self.itens.aggregate(total=Sum('subtotal'))['total'] or 0
+        Sale.objects.filter(pk=self.pk).update(valor_total=total)
         self.valor_total = total
-        self.save()
+        # O UPDATE direto não dispara signals
+        invalidar_dashboard(self.usuario_id)
         return total
 
 
+# =============================================================================
+# MANAGER: SaleItem
+# =============================================================================
+class SaleItemManager(models.Manager):
+    """
+    Manager dos itens de venda.
+    Garante que o subtotal seja preenchido também nas inserções em lote,
+    já que bulk_create não passa pelo save() do modelo.
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = list(objs)
+        for item in objs:
+            item.subtotal = item.calcular_subtotal()
+        return super().bulk_create(objs, *args, **kwargs)
+
+
 # =============================================================================
 # MODELO: SaleItem
 # =============================================================================
@@ -333,6 +461,8 @@ class SaleItem(models.Model):
         help_text="Subtotal do item (quantidade x preço)"
     )
 
+    objects = SaleItemManager()
+
     class Meta:
         verbose_name = "Item de Venda"
         verbose_name_plural = "Itens de Venda"
@@ -340,14 +470,20 @@ class SaleItem(models.Model):
     def __str__(self):
         return f"{self.produto.nome} x {self.quantidade}"
 
+    def calcular_subtotal(self):
+        """
+        Retorna o subtotal do item (quantidade x preço unitário).
+        """
+        return self.quantidade * self.preco_unitario
+
     def save(self, *args, **kwargs):
         """
         Sobrescreve o método save para calcular o subtotal automaticamente.
         """
-        self.subtotal = self.quantidade * self.preco_unitario
+        self.subtotal = self.calcular_subtotal()
         super().save(*args, **kwargs)
-        # Recalcula o valor total da venda
-        self.venda.calcular_valor_total()
+        # O valor total da venda é recalculado pelo signal post_save
+        # (vendas/signals.py), uma única vez por transação
 
 
 # =============================================================================
@@ -423,6 +559,13 @@ class AccountsReceivable(models.Model):
         verbose_name = "Conta a Receber"
         verbose_name_plural = "Contas a Receber"
         ordering = ['data_vencimento']
+        # Índice para os filtros por status e vencimento de cada usuário
+        indexes = [
+            # Listagem filtrada por status e ordenada por vencimento, resumo
+            # por status, dashboard e atualização de status em lote (todas
+            # filtram por usuario e status primeiro)
+            models.Index(fields=['usuario', 'status', 'data_vencimento']),
+        ]
 
     def __str__(self):
         return f"Conta #{self.id} - {self.cliente.nome} - R$ {self.valor}"
@@ -430,16 +573,45 @@ class AccountsReceivable(models.Model):
     def atualizar_status(self):
         """
         Atualiza o status automaticamente baseado na data de vencimento.
+        Só grava (apenas a coluna status) quando o status muda.
         """
         if self.status == 'pago':
             return
 
         hoje = timezone.now().date()
-        if self.data_vencimento < hoje:
-            self.status = 'vencido'
-        else:
-            self.status = 'pendente'
-        self.save()
+        novo_status = 'vencido' if self.data_vencimento < hoje else 'pendente'
+        if novo_status == self.status:
+            return
+        self.status = novo_status
+        self.save(update_fields=['status'])
+
+    @classmethod
+    def atualizar_status_em_lote(cls, usuario=None):
+        """
+        Atualiza o status de todas as contas não pagas com dois UPDATEs,
+        em vez de chamar atualizar_status() (e save()) conta a conta.
+
+        Args:
+            usuario: Se informado, restringe às contas deste usuário
+
+        Returns:
+            Quantidade de contas alteradas
+        """
+        hoje = timezone.now().date()
+        contas = cls.objects.all()
+        if usuario is not None:
+            contas = contas.filter(usuario=usuario)
+        a_vencer = contas.filter(status='pendente', data_vencimento__lt=hoje)
+        a_reabrir = contas.filter(status='vencido', data_vencimento__gte=hoje)
+        # Usuários afetados, para invalidar o cache do dashboard
+        # (o UPDATE direto não dispara signals)
+        usuarios_ids = set(
+            (a_vencer | a_reabrir).values_list('usuario_id', flat=True).distinct()
+        )
+        vencidas = a_vencer.update(status='vencido')
+        pendentes = a_reabrir.update(status='pendente')
+        invalidar_dashboard(*usuarios_ids)
+        return vencidas + pendentes
 
 
 # =============================================================================
@@ -506,6 +678,13 @@ class AccountsPayable(models.Model):
         verbose_name = "Conta a Pagar"
         verbose_name_plural = "Contas a Pagar"
         ordering = ['data_vencimento']
+        # Índice para os filtros por status e vencimento de cada usuário
+        indexes = [
+            # Listagem filtrada por status e ordenada por vencimento, resumo
+            # por status, dashboard e atualização de status em lote (todas
+            # filtram por usuario e status primeiro)
+            models.Index(fields=['usuario', 'status', 'data_vencimento']),
+        ]
 
     def __str__(self):
         return f"Boleto #{self.id} - {self.descricao} - R$ {self.valor}"
@@ -513,13 +692,42 @@ class AccountsPayable(models.Model):
     def atualizar_status(self):
         """
         Atualiza o status automaticamente baseado na data de vencimento.
+        Só grava (apenas a coluna status) quando o status muda.
         """
         if self.status == 'pago':
             return
 
         hoje = timezone.now().date()
-        if self.data_vencimento < hoje:
-            self.status = 'vencido'
-        else:
-            self.status = 'pendente'
-        self.save()
\ No newline at end of file
+        novo_status = 'vencido' if self.data_vencimento < hoje else 'pendente'
+        if novo_status == self.status:
+            return
+        self.status = novo_status
+        self.save(update_fields=['status'])
+
+    @classmethod
+    def atualizar_status_em_lote(cls, usuario=None):
+        """
+        Atualiza o status de todas as contas não pagas com dois UPDATEs,
+        em vez de chamar atualizar_status() (e save()) conta a conta.
+
+        Args:
+            usuario: Se informado, restringe às contas deste usuário
+
+        Returns:
+            Quantidade de contas alteradas
+        """
+        hoje = timezone.now().date()
+        contas = cls.objects.all()
+        if usuario is not None:
+            contas = contas.filter(usuario=usuario)
+        a_vencer = contas.filter(status='pendente', data_vencimento__lt=hoje)
+        a_reabrir = contas.filter(status='vencido', data_vencimento__gte=hoje)
+        # Usuários afetados, para invalidar o cache do dashboard
+        # (o UPDATE direto não dispara signals)
+        usuarios_ids = set(
+            (a_vencer | a_reabrir).values_list('usuario_id', flat=True).distinct()
+        )
+        vencidas = a_vencer.update(status='vencido')
+        pendentes = a_reabrir.update(status='pendente')
+        invalidar_dashboard(*usuarios_ids)
+        return vencidas + pendentes
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+=============================================================================
+ARQUIVO: vendas/paginators.py
+=============================================================================
+Objetivo: Paginadores personalizados
+Descrição: Aqui ficam paginadores que evitam consultas caras em tabelas
+           grandes
+=============================================================================
+"""
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+# =============================================================================
+# PAGINADOR: EstimatedCountPaginator
+# =============================================================================
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador que usa a estimativa de linhas do PostgreSQL (pg_class.reltuples)
+    em vez de SELECT COUNT(*) quando a listagem não tem filtros.
+
+    Com filtros, em outros bancos ou em tabelas pequenas, usa a contagem real.
+    """
+    # Abaixo deste número de linhas a contagem real é barata e exata
+    LIMITE_ESTIMATIVA = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None or query.where:
+            return super().count
+
+        connection = connections[self.object_list.db]
+        if connection.vendor != 'postgresql':
+            return super().count
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE relname = %s',
+                [self.object_list.model._meta.db_table]
+            )
+            linha = cursor.fetchone()
+
+        estimativa = linha[0] if linha else 0
+        if estimativa < self.LIMITE_ESTIMATIVA:
+            return super().count
+        return estimativa
@@ -0,0 +1,220 @@
+"""
+=============================================================================
+ARQUIVO: vendas/pdf.py
+=============================================================================
+Objetivo: Geração do recibo da venda em PDF
+Descrição: Aqui montamos o PDF da venda (reportlab) fora da view, para que
+           ele possa ser gerado tanto na requisição quanto por um processo
+           separado (ex.: um worker de fila)
+=============================================================================
+"""
+
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+
+from .models import SaleItem, AccountsReceivable
+
+
+# =============================================================================
+# ESTILOS DO PDF
+# =============================================================================
+# Estilos do PDF, criados uma única vez ao carregar o módulo (não mudam
+# entre uma venda e outra; o Table copia os comandos do TableStyle).
+# A folha de estilos padrão do reportlab também é montada só aqui.
+_ESTILOS_BASE_PDF = getSampleStyleSheet()
+
+_ESTILO_TITULO = ParagraphStyle(
+    'CustomTitle',
+    parent=_ESTILOS_BASE_PDF['Heading1'],
+    fontSize=24,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+
+_ESTILO_SECAO = ParagraphStyle(
+    'CustomHeading',
+    parent=_ESTILOS_BASE_PDF['Heading2'],
+    fontSize=12,
+    textColor=colors.HexColor('#2c3e50'),
+    spaceAfter=10,
+    fontName='Helvetica-Bold'
+)
+
+_ESTILO_NORMAL = ParagraphStyle(
+    'CustomNormal',
+    parent=_ESTILOS_BASE_PDF['Normal'],
+    fontSize=10,
+    spaceAfter=5,
+)
+
+_ESTILO_RODAPE = ParagraphStyle(
+    'Rodape',
+    parent=_ESTILOS_BASE_PDF['Normal'],
+    fontSize=8,
+    textColor=colors.grey,
+    alignment=TA_CENTER,
+)
+
+_ESTILO_TABELA_ITENS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f8f9fa')]),
+])
+
+_ESTILO_TABELA_PARCELAS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
+])
+
+
+# =============================================================================
+# FUNÇÃO: gerar_pdf_venda
+# =============================================================================
+def gerar_pdf_venda(venda, usuario):
+    """
+    Monta o recibo da venda em PDF.
+
+    Args:
+        venda (Sale): Venda, com o cliente já carregado (select_related)
+        usuario (User): Vendedor exibido no recibo
+
+    Returns:
+        BytesIO com o PDF, já posicionado no início para leitura
+    """
+    # Itens da venda como tuplas, com o nome do produto na mesma consulta
+    # (sem montar objetos SaleItem/Product só para ler quatro valores)
+    itens = SaleItem.objects.filter(venda=venda).values_list(
+        'produto__nome', 'quantidade', 'preco_unitario', 'subtotal',
+    )
+    
+    # Contas a receber como tuplas (valor, vencimento), usadas nas parcelas
+    contas_receber = AccountsReceivable.objects.filter(venda=venda).values_list(
+        'valor', 'data_vencimento',
+    ).order_by('data_vencimento')
+    
+    # Cria o PDF em memória
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
+    elements = []
+    
+    # Título
+    elements.append(Paragraph('RECIBO DE VENDA', _ESTILO_TITULO))
+    elements.append(Spacer(1, 0.2 * inch))
+    
+    # Informações da empresa (usuário)
+    empresa_info = f"""
+    <b>Vendedor:</b> {usuario.first_name or usuario.username}<br/>
+    <b>Email:</b> {usuario.email}<br/>
+    <b>Data:</b> {venda.data_venda.strftime('%d/%m/%Y %H:%M')}<br/>
+    """
+    elements.append(Paragraph(empresa_info, _ESTILO_NORMAL))
+    elements.append(Spacer(1, 0.2 * inch))
+    
+    # Informações do cliente
+    elements.append(Paragraph('<b>DADOS DO CLIENTE</b>', _ESTILO_SECAO))
+    cliente_info = f"""
+    <b>Nome:</b> {venda.cliente.nome}<br/>
+    <b>Email:</b> {venda.cliente.email or '-'}<br/>
+    <b>Telefone:</b> {venda.cliente.telefone or '-'}<br/>
+    <b>CPF/CNPJ:</b> {venda.cliente.cpf_cnpj or '-'}<br/>
+    <b>Endereço:</b> {venda.cliente.endereco or '-'}<br/>
+    """
+    elements.append(Paragraph(cliente_info, _ESTILO_NORMAL))
+    elements.append(Spacer(1, 0.2 * inch))
+    
+    # Tabela de produtos
+    elements.append(Paragraph('<b>PRODUTOS</b>', _ESTILO_SECAO))
+    
+    # Dados da tabela (o produto pode ter sido excluído: produto__nome é None).
+    # As linhas são lidas com iterator(), sem guardar também o cache do
+    # queryset: só as linhas já formatadas ficam na memória.
+    data = [['Produto', 'Quantidade', 'Preço Unit.', 'Subtotal']] + [
+        [nome or '-', str(quantidade), f'R$ {preco_unitario:.2f}', f'R$ {subtotal:.2f}']
+        for nome, quantidade, preco_unitario, subtotal in itens.iterator()
+    ]
+    
+    # Adiciona linha de total
+    data.append([
+        '',
+        '',
+        '<b>TOTAL:</b>',
+        f'<b>R$ {venda.valor_total:.2f}</b>'
+    ])
+    
+    # Cria a tabela
+    table = Table(data, colWidths=[3 * inch, 1.2 * inch, 1.2 * inch, 1.2 * inch])
+    table.setStyle(_ESTILO_TABELA_ITENS)
+    
+    elements.append(table)
+    elements.append(Spacer(1, 0.3 * inch))
+    
+    # Informações de pagamento
+    elements.append(Paragraph('<b>INFORMAÇÕES DE PAGAMENTO</b>', _ESTILO_SECAO))
+    pagamento_info = f"""
+    <b>Forma de Pagamento:</b> {venda.get_forma_pagamento_display()}<br/>
+    """
+    
+    if venda.observacoes:
+        pagamento_info += f"<b>Observações:</b> {venda.observacoes}<br/>"
+    
+    elements.append(Paragraph(pagamento_info, _ESTILO_NORMAL))
+    elements.append(Spacer(1, 0.2 * inch))
+    
+    # Tabela de parcelas (lidas uma única vez; o total é contado na lista)
+    parcelas = list(contas_receber)
+    total_parcelas = len(parcelas)
+    if parcelas:
+        elements.append(Paragraph('<b>PARCELAS</b>', _ESTILO_SECAO))
+        
+        parcelas_data = [
+            ['Parcela', 'Valor', 'Vencimento']
+        ]
+        
+        for idx, (valor, data_vencimento) in enumerate(parcelas, 1):
+            parcelas_data.append([
+                f'Parcela {idx}' if total_parcelas > 1 else 'Única',
+                f'R$ {valor:.2f}',
+                data_vencimento.strftime('%d/%m/%Y')
+            ])
+        
+        parcelas_table = Table(parcelas_data, colWidths=[2 * inch, 2 * inch, 2 * inch])
+        parcelas_table.setStyle(_ESTILO_TABELA_PARCELAS)
+        
+        elements.append(parcelas_table)
+        elements.append(Spacer(1, 0.3 * inch))
+    
+    # Rodapé
+    rodape = """
+    <i>Este é um recibo de venda. Guarde para sua segurança.<br/>
+    Gerado automaticamente pelo sistema Vendas App</i>
+    """
+    elements.append(Paragraph(rodape, _ESTILO_RODAPE))
+    
+    # Constrói o PDF (o build do reportlab consome a lista, descartando
+    # cada elemento assim que ele é posicionado na página)
+    doc.build(elements)
+    
+    # Volta ao início do buffer para a leitura
+    buffer.seek(0)
+    return buffer
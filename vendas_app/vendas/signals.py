@@ -0,0 +1,223 @@
+"""
+=============================================================================
+ARQUIVO: vendas/signals.py
+=============================================================================
+Objetivo: Reagir a eventos dos modelos (post_save, post_delete, etc.)
+Descrição: Aqui mantemos dados derivados sincronizados com os modelos
+=============================================================================
+"""
+
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVector
+from django.db import connection, transaction
+from django.db.models import Subquery, Value
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from .cache import (
+    invalidar_clientes_ativos, invalidar_dashboard, invalidar_marcas,
+    invalidar_usuario_email,
+)
+from .models import (
+    AccountsPayable, AccountsReceivable, Client, Marca, Product, Sale, SaleItem,
+)
+
+
+# =============================================================================
+# VALOR TOTAL: Sale.valor_total
+# =============================================================================
+# Campos de SaleItem que afetam o valor total da venda
+CAMPOS_VALOR_ITEM = {'venda', 'venda_id', 'quantidade', 'preco_unitario', 'subtotal'}
+
+def _recalcular_venda(venda_id, using=None):
+    """
+    Recalcula o valor total da venda (executado após o commit).
+    """
+    venda = Sale.objects.using(using).filter(pk=venda_id).first()
+    if venda is not None:
+        venda.calcular_valor_total()
+
+
+def _agendar_recalculo_venda(venda_id, using=None):
+    """
+    Agenda o recálculo do valor total para o commit da transação.
+    Vários itens salvos na mesma transação geram um único recálculo.
+    Fora de uma transação o recálculo é feito na hora.
+
+    O controle do que já foi agendado é a própria fila de callbacks da
+    conexão (run_on_commit): ela é por transação e por banco, e o Django a
+    esvazia no commit e no rollback (inclusive de savepoints), então um
+    agendamento perdido num rollback nunca impede o recálculo seguinte.
+    """
+    conexao = transaction.get_connection(using)
+    if not conexao.in_atomic_block:
+        _recalcular_venda(venda_id, using)
+        return
+
+    for _, callback, *_ in conexao.run_on_commit:
+        if (
+            getattr(callback, 'func', None) is _recalcular_venda
+            and callback.args == (venda_id, using)
+        ):
+            return
+    transaction.on_commit(partial(_recalcular_venda, venda_id, using), using=using)
+
+
+@receiver(post_save, sender=SaleItem)
+def recalcular_venda_ao_salvar_item(sender, instance, update_fields=None, **kwargs):
+    """
+    Recalcula o valor total da venda quando um item é salvo, a menos que
+    apenas campos sem efeito no valor tenham sido atualizados.
+    """
+    if update_fields is not None and not CAMPOS_VALOR_ITEM.intersection(update_fields):
+        return
+    _agendar_recalculo_venda(instance.venda_id, kwargs.get('using'))
+
+
+@receiver(post_delete, sender=SaleItem)
+def recalcular_venda_ao_remover_item(sender, instance, using=None, **kwargs):
+    """
+    Recalcula o valor total da venda quando um item é removido.
+    """
+    _agendar_recalculo_venda(instance.venda_id, using)
+
+
+# =============================================================================
+# BUSCA TEXTUAL: Sale.search_vector
+# =============================================================================
+# Campos de Sale que compõem o vetor de busca
+CAMPOS_BUSCA_VENDA = {'cliente', 'cliente_id', 'observacoes'}
+
+
+def _vetor_busca_venda(nome_cliente):
+    """
+    Monta a expressão do vetor de busca de uma venda
+    (nome do cliente + observações).
+
+    Args:
+        nome_cliente: Expressão com o nome do cliente (Value ou Subquery)
+    """
+    return SearchVector(nome_cliente, 'observacoes', config='portuguese')
+
+
+@receiver(post_save, sender=Sale)
+def atualizar_busca_venda(sender, instance, update_fields=None, raw=False, **kwargs):
+    """
+    Atualiza o vetor de busca da venda após salvar (somente PostgreSQL).
+    Salvamentos parciais que não mexem no cliente nem nas observações
+    não afetam a busca e não geram o UPDATE.
+    """
+    if raw or connection.vendor != 'postgresql':
+        return
+    if update_fields is not None and not CAMPOS_BUSCA_VENDA.intersection(update_fields):
+        return
+    # Usa o cliente já carregado (select_related); senão o nome é lido pelo
+    # cliente_id dentro do próprio UPDATE, sem um SELECT a mais
+    if Sale.cliente.is_cached(instance):
+        nome_cliente = Value(instance.cliente.nome or '')
+    else:
+        nome_cliente = Subquery(
+            Client.objects.filter(pk=instance.cliente_id).order_by().values('nome')[:1]
+        )
+    Sale.objects.filter(pk=instance.pk).update(
+        search_vector=_vetor_busca_venda(nome_cliente)
+    )
+
+
+@receiver(post_save, sender=Client)
+def atualizar_busca_vendas_cliente(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Quando o cliente é alterado, atualiza o vetor de busca de suas vendas
+    (somente PostgreSQL).
+    """
+    if created or connection.vendor != 'postgresql':
+        return
+    # Salvamentos parciais que não mexem no nome não afetam a busca
+    if update_fields is not None and 'nome' not in update_fields:
+        return
+    Sale.objects.filter(cliente=instance).update(
+        search_vector=_vetor_busca_venda(Value(instance.nome or ''))
+    )
+
+
+# =============================================================================
+# CACHE: Marcas
+# =============================================================================
+@receiver(post_save, sender=Marca)
+@receiver(post_delete, sender=Marca)
+def limpar_cache_marcas(sender, **kwargs):
+    """
+    Limpa o cache de marcas quando uma marca é criada, alterada ou removida.
+    """
+    invalidar_marcas()
+
+
+# =============================================================================
+# CACHE: Clientes ativos
+# =============================================================================
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def limpar_cache_clientes_ativos(sender, instance, **kwargs):
+    """
+    Limpa a lista de clientes ativos do usuário quando um cliente é
+    criado, alterado ou removido.
+    """
+    invalidar_clientes_ativos(instance.usuario_id)
+
+
+# =============================================================================
+# CACHE: Dashboard
+# =============================================================================
+@receiver(post_save, sender=Sale)
+@receiver(post_delete, sender=Sale)
+@receiver(post_save, sender=AccountsReceivable)
+@receiver(post_delete, sender=AccountsReceivable)
+@receiver(post_save, sender=AccountsPayable)
+@receiver(post_delete, sender=AccountsPayable)
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidar_cache_dashboard(sender, instance, **kwargs):
+    """
+    Invalida o cache do dashboard do usuário dono do registro alterado.
+    """
+    invalidar_dashboard(instance.usuario_id)
+
+
+# =============================================================================
+# CACHE: Usuário por email (login)
+# =============================================================================
+@receiver(pre_save, sender=get_user_model())
+def guardar_email_anterior_usuario(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Guarda o email gravado no banco antes da alteração, para que a chave do
+    email antigo também saia do cache quando o email é trocado.
+    """
+    if raw or instance.pk is None:
+        return
+    if update_fields is not None and 'email' not in update_fields:
+        return
+    instance._email_anterior = (
+        sender._default_manager
+        .filter(pk=instance.pk)
+        .values_list('email', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidar_cache_usuario_email(sender, instance, update_fields=None, **kwargs):
+    """
+    Remove o usuário do cache de login quando ele é alterado ou removido
+    (ex.: troca de email ou desativação), tanto pelo email atual quanto
+    pelo anterior. A gravação de last_login feita a cada login não
+    invalida o cache.
+    """
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    email_anterior = instance.__dict__.pop('_email_anterior', None)
+    invalidar_usuario_email(instance.email, email_anterior)
@@ -1,3 +1,899 @@
+"""
+=============================================================================
+ARQUIVO: vendas/tests.py
+=============================================================================
+Objetivo: Testes automatizados da aplicação de vendas
+Descrição: Aqui conferimos os resultados e a quantidade de consultas das
+           views, modelos, signals e comandos da aplicação
+=============================================================================
+"""
+
+import re
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .backends import usuario_por_email
+from .cache import (
+    CHAVE_MARCAS, chave_dashboard, chave_usuario_email, versao_dashboard,
+)
+from .forms import DecimalComVirgulaField, ProdutoForm
+from .models import (
+    AccountsPayable, AccountsReceivable, Client, Marca, Product, Sale, SaleItem,
+)
+from .pdf import gerar_pdf_venda
+
+
+class BaseVendasTestCase(TestCase):
+    """
+    Dados básicos usados pelos testes: um usuário com um cliente e um
+    produto. O cache é limpo antes de cada teste.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.usuario = User.objects.create_user('ana', 'ana@exemplo.com', 'senha-forte-123')
+        cls.cliente = Client.objects.create(usuario=cls.usuario, nome='Cliente Teste')
+        cls.marca = Marca.objects.create(nome='Marca Teste')
+        cls.produto = Product.objects.create(
+            usuario=cls.usuario, nome='Produto Teste', preco=Decimal('10.00'),
+            marca=cls.marca, estoque=50,
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def criar_venda(self, **kwargs):
+        dados = {
+            'usuario': self.usuario,
+            'cliente': self.cliente,
+            'data_vencimento': date(2024, 1, 31),
+        }
+        dados.update(kwargs)
+        return Sale.objects.create(**dados)
+
+
+# =============================================================================
+# TESTES: Recálculo do valor total (vendas/signals.py)
+# =============================================================================
+class RecalculoValorTotalTests(BaseVendasTestCase):
+
+    def test_itens_da_mesma_transacao_geram_um_unico_recalculo(self):
+        venda = self.criar_venda()
+        with self.captureOnCommitCallbacks() as callbacks:
+            SaleItem.objects.create(venda=venda, produto=self.produto, quantidade=2, preco_unitario=Decimal('10.00'))
+            SaleItem.objects.create(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('5.50'))
+        self.assertEqual(len(callbacks), 1)
+
+        # Busca da venda + aggregate + UPDATE
+        with self.assertNumQueries(3):
+            callbacks[0]()
+        venda.refresh_from_db()
+        self.assertEqual(venda.valor_total, Decimal('25.50'))
+
+    def test_rollback_nao_impede_o_recalculo_seguinte(self):
+        venda = self.criar_venda()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    SaleItem.objects.create(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('99.00'))
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            SaleItem.objects.create(venda=venda, produto=self.produto, quantidade=3, preco_unitario=Decimal('2.00'))
+        self.assertEqual(len(callbacks), 1)
+        venda.refresh_from_db()
+        self.assertEqual(venda.valor_total, Decimal('6.00'))
+
+    def test_campos_sem_efeito_no_valor_nao_agendam_recalculo(self):
+        venda = self.criar_venda()
+        item = SaleItem.objects.create(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('10.00'))
+        with self.captureOnCommitCallbacks() as callbacks:
+            item.save(update_fields=['produto'])
+        self.assertEqual(callbacks, [])
+
+    def test_remover_item_recalcula(self):
+        venda = self.criar_venda()
+        # bulk_create não dispara signals
+        item, _ = SaleItem.objects.bulk_create([
+            SaleItem(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('10.00')),
+            SaleItem(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('4.00')),
+        ])
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            item.delete()
+        self.assertEqual(len(callbacks), 1)
+        venda.refresh_from_db()
+        self.assertEqual(venda.valor_total, Decimal('4.00'))
+
+
+# =============================================================================
+# TESTES: Login por email (vendas/backends.py)
+# =============================================================================
+class EmailBackendTests(BaseVendasTestCase):
+
+    def test_autentica_sem_diferenciar_maiusculas(self):
+        usuario = authenticate(None, email='ANA@Exemplo.com', password='senha-forte-123')
+        self.assertEqual(usuario, self.usuario)
+
+    def test_senha_errada_ou_email_inexistente(self):
+        self.assertIsNone(authenticate(None, email='ana@exemplo.com', password='errada'))
+        self.assertIsNone(authenticate(None, email='ninguem@exemplo.com', password='senha-forte-123'))
+
+    def test_cache_guarda_apenas_o_pk(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(usuario_por_email('ana@exemplo.com'), self.usuario)
+        self.assertEqual(cache.get(chave_usuario_email('ana@exemplo.com')), self.usuario.pk)
+
+        # Com o pk em cache, o usuário é carregado pela chave primária
+        with self.assertNumQueries(1) as consultas:
+            self.assertEqual(usuario_por_email('Ana@Exemplo.com'), self.usuario)
+        self.assertIn('"auth_user"."id" =', consultas.captured_queries[0]['sql'])
+
+    def test_troca_de_email_invalida_o_email_antigo(self):
+        usuario_por_email('ana@exemplo.com')
+        self.usuario.email = 'nova@exemplo.com'
+        self.usuario.save()
+
+        self.assertIsNone(cache.get(chave_usuario_email('ana@exemplo.com')))
+        self.assertIsNone(authenticate(None, email='ana@exemplo.com', password='senha-forte-123'))
+        self.assertEqual(
+            authenticate(None, email='nova@exemplo.com', password='senha-forte-123'),
+            self.usuario,
+        )
+
+    def test_last_login_nao_invalida_o_cache(self):
+        usuario_por_email('ana@exemplo.com')
+        self.usuario.save(update_fields=['last_login'])
+        self.assertEqual(cache.get(chave_usuario_email('ana@exemplo.com')), self.usuario.pk)
+
+
+# =============================================================================
+# TESTES: Cache do dashboard (vendas/cache.py)
+# =============================================================================
+class DashboardCacheTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:home')
+
+    def test_segunda_visita_usa_o_cache(self):
+        self.client.get(self.url)
+        # Sessão + usuário; o resumo vem do cache
+        with self.assertNumQueries(2):
+            resposta = self.client.get(self.url)
+        self.assertEqual(resposta.context['total_clientes'], 1)
+        self.assertEqual(resposta.context['total_produtos'], 1)
+
+    def test_alteracao_troca_a_versao_e_atualiza_o_resumo(self):
+        self.client.get(self.url)
+        versao = versao_dashboard(self.usuario.id)
+        chave = chave_dashboard(self.usuario.id, timezone.now().date())
+
+        Client.objects.create(usuario=self.usuario, nome='Outro Cliente')
+
+        self.assertNotEqual(versao_dashboard(self.usuario.id), versao)
+        self.assertNotEqual(chave_dashboard(self.usuario.id, timezone.now().date()), chave)
+        resposta = self.client.get(self.url)
+        self.assertEqual(resposta.context['total_clientes'], 2)
+
+    def test_alteracao_de_outro_usuario_nao_invalida(self):
+        outro = User.objects.create_user('bia', 'bia@exemplo.com', 'senha-forte-123')
+        versao = versao_dashboard(self.usuario.id)
+        Client.objects.create(usuario=outro, nome='Cliente da Bia')
+        self.assertEqual(versao_dashboard(self.usuario.id), versao)
+
+
+# =============================================================================
+# TESTES: Exclusão em lote (SaleManager.excluir_em_lote)
+# =============================================================================
+class ExcluirEmLoteTests(BaseVendasTestCase):
+
+    def criar_venda_completa(self):
+        venda = self.criar_venda()
+        SaleItem.objects.bulk_create([
+            SaleItem(venda=venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('10.00')),
+            SaleItem(venda=venda, produto=self.produto, quantidade=2, preco_unitario=Decimal('10.00')),
+        ])
+        AccountsReceivable.objects.create(
+            usuario=self.usuario, venda=venda, cliente=self.cliente,
+            valor=Decimal('30.00'), data_vencimento=date(2024, 1, 31),
+        )
+        return venda
+
+    def test_exclui_vendas_itens_e_contas(self):
+        excluir = [self.criar_venda_completa() for _ in range(3)]
+        manter = self.criar_venda_completa()
+        versao = versao_dashboard(self.usuario.id)
+
+        # usuários + 3 DELETEs (itens, contas, vendas), dentro de um savepoint
+        with self.assertNumQueries(6):
+            excluidas = Sale.objects.excluir_em_lote(
+                Sale.objects.filter(pk__in=[venda.pk for venda in excluir])
+            )
+
+        self.assertEqual(excluidas, 3)
+        self.assertQuerySetEqual(Sale.objects.all(), [manter])
+        self.assertEqual(SaleItem.objects.filter(venda=manter).count(), 2)
+        self.assertEqual(SaleItem.objects.count(), 2)
+        self.assertEqual(AccountsReceivable.objects.count(), 1)
+        self.assertNotEqual(versao_dashboard(self.usuario.id), versao)
+
+
+# =============================================================================
+# TESTES: Paginação por cursor no admin (vendas/admin.py)
+# =============================================================================
+class PaginacaoCursorAdminTests(BaseVendasTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = User.objects.create_superuser('admin', 'admin@exemplo.com', 'senha-forte-123')
+        for i in range(150):
+            Client.objects.create(usuario=cls.usuario, nome=f'Cliente {i:03d}')
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.admin)
+        self.url = reverse('admin:vendas_client_changelist')
+
+    def ids_da_pagina(self, resposta):
+        return [obj.pk for obj in resposta.context['cl'].result_list]
+
+    def test_cursor_continua_do_ultimo_registro(self):
+        primeira = self.client.get(self.url)
+        proxima = primeira.context['cl'].url_proxima_pagina
+        self.assertIn('cursor=', proxima)
+
+        por_cursor = self.client.get(self.url + proxima)
+        por_offset = self.client.get(self.url + '?p=2')
+        self.assertEqual(self.ids_da_pagina(por_cursor), self.ids_da_pagina(por_offset))
+        self.assertTrue(por_cursor.context['cl'].cursor_ativo)
+        self.assertEqual(len(set(self.ids_da_pagina(primeira)) & set(self.ids_da_pagina(por_cursor))), 0)
+
+    def test_links_de_pagina_nao_levam_o_cursor(self):
+        primeira = self.client.get(self.url)
+        por_cursor = self.client.get(self.url + primeira.context['cl'].url_proxima_pagina)
+        html = por_cursor.content.decode()
+        paginador = re.search(r'<p class="paginator">(.*?)</p>', html, re.S).group(1)
+        self.assertNotIn('p=', paginador.split('Próxima página')[0])
+        self.assertIn('Primeira página', paginador)
+        self.assertNotIn('cursor', por_cursor.context['cl'].get_query_string({'p': 1}))
+
+    def test_cursor_invalido(self):
+        resposta = self.client.get(self.url + '?cursor=abc')
+        self.assertEqual(resposta.status_code, 302)
+
+
+# =============================================================================
+# TESTES: Criação de venda (views.venda_create)
+# =============================================================================
+class VendaCreateTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:venda_create')
+        self.outro_produto = Product.objects.create(
+            usuario=self.usuario, nome='Outro Produto', preco=Decimal('7.25'), marca=self.marca,
+        )
+
+    def dados(self, **kwargs):
+        dados = {
+            'cliente': self.cliente.pk,
+            'forma_pagamento': 'boleto',
+            'data_vencimento': '2024-01-31',
+            'parcelas': '3',
+            'produto_id[]': [self.produto.pk, self.outro_produto.pk],
+            'quantidade[]': ['2', '4'],
+            'preco[]': ['10,00', '7.25'],
+        }
+        dados.update(kwargs)
+        return dados
+
+    def test_cria_venda_itens_e_parcelas_em_lote(self):
+        # Consultas fixas, independentes do número de itens e parcelas
+        with self.assertNumQueries(12):
+            resposta = self.client.post(self.url, self.dados())
+
+        venda = Sale.objects.get()
+        self.assertRedirects(resposta, reverse('vendas:venda_detail', args=[venda.pk]), fetch_redirect_response=False)
+        self.assertEqual(venda.valor_total, Decimal('49.00'))
+        self.assertEqual(
+            sorted(venda.itens.values_list('quantidade', 'subtotal')),
+            [(2, Decimal('20.00')), (4, Decimal('29.00'))],
+        )
+        parcelas = list(venda.contas_receber_venda.order_by('data_vencimento'))
+        self.assertEqual([conta.valor for conta in parcelas], [Decimal('16.33')] * 3)
+
+    def test_datas_das_parcelas_usam_o_ultimo_dia_do_mes(self):
+        self.client.post(self.url, self.dados(parcelas='4'))
+        datas = list(
+            AccountsReceivable.objects.order_by('data_vencimento')
+            .values_list('data_vencimento', flat=True)
+        )
+        self.assertEqual(datas, [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)])
+
+    def test_preco_fora_do_limite_nao_cria_venda(self):
+        resposta = self.client.post(self.url, self.dados(**{'preco[]': ['99999999999', '7.25']}))
+        self.assertEqual(resposta.status_code, 200)
+        self.assertContains(resposta, 'Preço inválido para o produto')
+        self.assertFalse(Sale.objects.exists())
+
+    def test_ignora_ids_de_produto_invalidos(self):
+        self.client.post(self.url, self.dados(**{'produto_id[]': ['²', self.outro_produto.pk]}))
+        venda = Sale.objects.get()
+        self.assertEqual(venda.valor_total, Decimal('29.00'))
+
+
+# =============================================================================
+# TESTES: Contas a pagar (views.conta_pagar_create e conta_pagar_edit)
+# =============================================================================
+class ContaPagarFormTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.conta = AccountsPayable.objects.create(
+            usuario=self.usuario, descricao='Aluguel', valor=Decimal('100.00'),
+            data_vencimento=date(2024, 1, 10),
+        )
+
+    def dados(self, **kwargs):
+        dados = {'descricao': 'Energia', 'valor': '150,75', 'data_vencimento': '2024-02-10'}
+        dados.update(kwargs)
+        return dados
+
+    def test_cria_com_valor_decimal_com_virgula(self):
+        resposta = self.client.post(reverse('vendas:conta_pagar_create'), self.dados())
+        self.assertRedirects(resposta, reverse('vendas:contas_pagar_list'), fetch_redirect_response=False)
+        conta = AccountsPayable.objects.get(descricao='Energia')
+        self.assertEqual(conta.valor, Decimal('150.75'))
+        self.assertEqual(conta.data_vencimento, date(2024, 2, 10))
+
+    def test_cria_rejeita_valores_invalidos(self):
+        for valor in ['abc', 'NaN', 'Infinity', '0', '-5']:
+            with self.subTest(valor=valor):
+                resposta = self.client.post(reverse('vendas:conta_pagar_create'), self.dados(valor=valor))
+                self.assertEqual(resposta.status_code, 200)
+        self.assertFalse(AccountsPayable.objects.filter(descricao='Energia').exists())
+
+    def test_cria_rejeita_valor_fora_do_limite_da_coluna(self):
+        for valor in ['99999999999999', '1e20', '10,555']:
+            with self.subTest(valor=valor):
+                resposta = self.client.post(reverse('vendas:conta_pagar_create'), self.dados(valor=valor))
+                self.assertContains(resposta, 'Valor inválido')
+        self.assertFalse(AccountsPayable.objects.filter(descricao='Energia').exists())
+
+    def test_edita_com_valor_decimal(self):
+        url = reverse('vendas:conta_pagar_edit', args=[self.conta.pk])
+        resposta = self.client.post(url, self.dados(valor='99,90'))
+        self.assertRedirects(resposta, reverse('vendas:contas_pagar_list'), fetch_redirect_response=False)
+        self.conta.refresh_from_db()
+        self.assertEqual(self.conta.valor, Decimal('99.90'))
+        self.assertEqual(self.conta.descricao, 'Energia')
+
+    def test_edita_rejeita_valor_fora_do_limite_da_coluna(self):
+        url = reverse('vendas:conta_pagar_edit', args=[self.conta.pk])
+        for valor in ['99999999999999', '1e20']:
+            with self.subTest(valor=valor):
+                resposta = self.client.post(url, self.dados(valor=valor))
+                self.assertContains(resposta, 'Valor inválido')
+        self.conta.refresh_from_db()
+        self.assertEqual(self.conta.valor, Decimal('100.00'))
+        self.assertEqual(self.conta.descricao, 'Aluguel')
+
+
+# =============================================================================
+# TESTES: Atualização de status em lote nas listas de contas
+# =============================================================================
+class AtualizacaoStatusContasTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        hoje = timezone.now().date()
+        self.ontem = hoje - timedelta(days=1)
+        self.amanha = hoje + timedelta(days=1)
+
+    def criar_conta_pagar(self, usuario=None, **kwargs):
+        dados = {
+            'usuario': usuario or self.usuario,
+            'descricao': 'Conta',
+            'valor': Decimal('10.00'),
+        }
+        dados.update(kwargs)
+        return AccountsPayable.objects.create(**dados)
+
+    def test_lista_de_contas_a_pagar_atualiza_status(self):
+        atrasada = self.criar_conta_pagar(data_vencimento=self.ontem)
+        reaberta = self.criar_conta_pagar(data_vencimento=self.amanha, status='vencido')
+        paga = self.criar_conta_pagar(data_vencimento=self.ontem, status='pago')
+        outro = User.objects.create_user('bia', 'bia@exemplo.com', 'senha-forte-123')
+        de_outro_usuario = self.criar_conta_pagar(usuario=outro, data_vencimento=self.ontem)
+
+        self.client.get(reverse('vendas:contas_pagar_list'))
+
+        status = dict(AccountsPayable.objects.values_list('pk', 'status'))
+        self.assertEqual(status[atrasada.pk], 'vencido')
+        self.assertEqual(status[reaberta.pk], 'pendente')
+        self.assertEqual(status[paga.pk], 'pago')
+        self.assertEqual(status[de_outro_usuario.pk], 'pendente')
+
+    def test_lista_de_contas_a_receber_atualiza_status(self):
+        venda = self.criar_venda()
+        atrasada = AccountsReceivable.objects.create(
+            usuario=self.usuario, venda=venda, cliente=self.cliente,
+            valor=Decimal('10.00'), data_vencimento=self.ontem,
+        )
+        reaberta = AccountsReceivable.objects.create(
+            usuario=self.usuario, venda=venda, cliente=self.cliente,
+            valor=Decimal('10.00'), data_vencimento=self.amanha, status='vencido',
+        )
+
+        self.client.get(reverse('vendas:contas_receber_list'))
+
+        atrasada.refresh_from_db()
+        reaberta.refresh_from_db()
+        self.assertEqual(atrasada.status, 'vencido')
+        self.assertEqual(reaberta.status, 'pendente')
+
+    def test_atualizacao_em_lote_usa_updates_diretos(self):
+        for _ in range(5):
+            self.criar_conta_pagar(data_vencimento=self.ontem)
+        versao = versao_dashboard(self.usuario.id)
+
+        # Usuários afetados + 2 UPDATEs, independente da quantidade de contas
+        with self.assertNumQueries(3):
+            alteradas = AccountsPayable.atualizar_status_em_lote(self.usuario)
+
+        self.assertEqual(alteradas, 5)
+        self.assertFalse(AccountsPayable.objects.exclude(status='vencido').exists())
+        self.assertNotEqual(versao_dashboard(self.usuario.id), versao)
+
+
+# =============================================================================
+# TESTES: Totais e paginação das listas de contas
+# =============================================================================
+class TotaisContasTests(BaseVendasTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        hoje = timezone.now().date()
+        contas = [
+            AccountsPayable(usuario=cls.usuario, descricao=f'Pendente {i}', valor=Decimal('2.00'),
+                            data_vencimento=hoje + timedelta(days=i + 1))
+            for i in range(60)
+        ]
+        contas += [
+            AccountsPayable(usuario=cls.usuario, descricao=f'Paga {i}', valor=Decimal('5.00'),
+                            data_vencimento=hoje, status='pago')
+            for i in range(3)
+        ]
+        contas += [
+            AccountsPayable(usuario=cls.usuario, descricao=f'Vencida {i}', valor=Decimal('7.00'),
+                            data_vencimento=hoje - timedelta(days=1), status='vencido')
+            for i in range(2)
+        ]
+        AccountsPayable.objects.bulk_create(contas)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:contas_pagar_list')
+
+    def test_totais_por_status_em_uma_consulta(self):
+        # Sessão + usuário + status em lote (3) + totais + página
+        with self.assertNumQueries(7) as consultas:
+            resposta = self.client.get(self.url, {'status': 'pendente', 'page': 2})
+
+        contagens = [q['sql'] for q in consultas.captured_queries if 'COUNT(' in q['sql']]
+        self.assertEqual(len(contagens), 1, 'o Paginator não deve fazer outro COUNT')
+
+        contexto = resposta.context
+        self.assertEqual(contexto['total_contas'], 60)
+        self.assertEqual(contexto['valor_total'], Decimal('120.00'))
+        self.assertEqual(contexto['contas_pendentes'], Decimal('120.00'))
+        self.assertEqual(contexto['contas_pagas'], Decimal('15.00'))
+        self.assertEqual(contexto['contas_vencidas'], Decimal('14.00'))
+
+        pagina = contexto['page_obj']
+        self.assertEqual(pagina.number, 2)
+        self.assertEqual(pagina.paginator.num_pages, 2)
+        self.assertEqual(len(pagina.object_list), 10)
+        self.assertEqual(contexto['filtros_url'], 'status=pendente')
+
+    def test_filtro_de_busca_nos_totais(self):
+        resposta = self.client.get(self.url, {'status': 'todos', 'busca': 'Paga'})
+        self.assertEqual(resposta.context['total_contas'], 3)
+        self.assertEqual(resposta.context['valor_total'], Decimal('15.00'))
+        # O resumo por status continua considerando todas as contas
+        self.assertEqual(resposta.context['contas_pendentes'], Decimal('120.00'))
+
+
+# =============================================================================
+# TESTES: Recibo da venda em PDF (vendas/pdf.py)
+# =============================================================================
+class PdfVendaTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.venda = self.criar_venda()
+        SaleItem.objects.bulk_create([
+            SaleItem(venda=self.venda, produto=self.produto, quantidade=2, preco_unitario=Decimal('10.00')),
+            SaleItem(venda=self.venda, produto=self.produto, quantidade=1, preco_unitario=Decimal('3.00')),
+        ])
+        self.venda.calcular_valor_total()
+        AccountsReceivable.objects.bulk_create([
+            AccountsReceivable(
+                usuario=self.usuario, venda=self.venda, cliente=self.cliente,
+                valor=Decimal('11.50'), data_vencimento=date(2024, mes, 10),
+            )
+            for mes in (1, 2)
+        ])
+
+    def test_gera_pdf_com_duas_consultas(self):
+        venda = Sale.objects.select_related('cliente').get(pk=self.venda.pk)
+        # Itens (com o nome do produto) + parcelas
+        with self.assertNumQueries(2):
+            buffer = gerar_pdf_venda(venda, self.usuario)
+        self.assertEqual(buffer.tell(), 0)
+        self.assertTrue(buffer.read().startswith(b'%PDF'))
+
+    def test_view_retorna_o_pdf_como_anexo(self):
+        self.client.force_login(self.usuario)
+        url = reverse('vendas:venda_gerar_pdf', args=[self.venda.pk])
+        # Sessão + usuário + venda (com o cliente) + itens + parcelas
+        with self.assertNumQueries(5):
+            resposta = self.client.get(url)
+        self.assertEqual(resposta['Content-Type'], 'application/pdf')
+        self.assertIn(f'attachment; filename="venda_{self.venda.pk}.pdf"', resposta['Content-Disposition'])
+        self.assertTrue(b''.join(resposta.streaming_content).startswith(b'%PDF'))
+
+    def test_venda_de_outro_usuario(self):
+        outro = User.objects.create_user('bia', 'bia@exemplo.com', 'senha-forte-123')
+        self.client.force_login(outro)
+        resposta = self.client.get(reverse('vendas:venda_gerar_pdf', args=[self.venda.pk]))
+        self.assertEqual(resposta.status_code, 404)
+
+
+# =============================================================================
+# TESTES: Edição de produto (views.produto_edit)
+# =============================================================================
+class ProdutoEditTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:produto_edit', args=[self.produto.pk])
+
+    def dados(self, **kwargs):
+        dados = {
+            'nome': 'Produto Editado', 'preco': '12,50', 'estoque': '7',
+            'descricao': 'Nova descrição', 'marca': self.marca.pk, 'ativo': 'on',
+        }
+        dados.update(kwargs)
+        return dados
+
+    def test_grava_com_um_unico_update(self):
+        # Sessão + usuário + produto + marca (cache vazio) + UPDATE em um savepoint
+        with self.assertNumQueries(7) as consultas:
+            resposta = self.client.post(self.url, self.dados())
+        self.assertRedirects(resposta, reverse('vendas:produtos_list'), fetch_redirect_response=False)
+
+        escritas = [q['sql'] for q in consultas.captured_queries if q['sql'].startswith(('UPDATE', 'INSERT'))]
+        self.assertEqual(len(escritas), 1)
+        self.assertTrue(escritas[0].startswith('UPDATE "vendas_product"'))
+
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.nome, 'Produto Editado')
+        self.assertEqual(self.produto.preco, Decimal('12.50'))
+        self.assertEqual(self.produto.estoque, 7)
+        self.assertEqual(self.produto.descricao, 'Nova descrição')
+        self.assertTrue(self.produto.ativo)
+
+    def test_nome_repetido_e_recusado_pelo_banco(self):
+        Product.objects.create(usuario=self.usuario, nome='Outro', preco=Decimal('1.00'))
+        resposta = self.client.post(self.url, self.dados(nome='Outro'))
+        self.assertContains(resposta, 'Já existe outro produto com este nome!')
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.nome, 'Produto Teste')
+
+    def test_invalida_o_cache_do_dashboard(self):
+        versao = versao_dashboard(self.usuario.id)
+        self.client.post(self.url, self.dados(ativo=''))
+        self.assertNotEqual(versao_dashboard(self.usuario.id), versao)
+
+
+# =============================================================================
+# TESTES: Ajuste de estoque (views.produto_ajustar_estoque)
+# =============================================================================
+class AjusteEstoqueTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:produto_ajustar_estoque', args=[self.produto.pk])
+
+    def test_adicionar_soma_no_banco(self):
+        resposta = self.client.post(self.url, {'operacao': 'adicionar', 'quantidade': '5'})
+        self.assertRedirects(resposta, reverse('vendas:produto_detail', args=[self.produto.pk]), fetch_redirect_response=False)
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.estoque, 55)
+
+    def test_remover_com_um_unico_update_condicional(self):
+        # Sessão + usuário + produto + UPDATE ... WHERE estoque >= quantidade
+        with self.assertNumQueries(4) as consultas:
+            self.client.post(self.url, {'operacao': 'remover', 'quantidade': '20'})
+        update = consultas.captured_queries[-1]['sql']
+        self.assertTrue(update.startswith('UPDATE "vendas_product"'))
+        self.assertIn('"estoque" >= 20', update)
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.estoque, 30)
+
+    def test_remover_mais_que_o_estoque(self):
+        # Outro ajuste reduziu o estoque depois que a página foi aberta
+        Product.objects.filter(pk=self.produto.pk).update(estoque=3)
+        resposta = self.client.post(self.url, {'operacao': 'remover', 'quantidade': '4'})
+        self.assertContains(resposta, 'Estoque insuficiente! Disponível: 3')
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.estoque, 3)
+
+    def test_quantidade_invalida(self):
+        for quantidade in ['abc', '0', '-2']:
+            with self.subTest(quantidade=quantidade):
+                resposta = self.client.post(self.url, {'operacao': 'adicionar', 'quantidade': quantidade})
+                self.assertEqual(resposta.status_code, 200)
+        self.produto.refresh_from_db()
+        self.assertEqual(self.produto.estoque, 50)
+
+
+# =============================================================================
+# TESTES: Formulário de produto (vendas/forms.py)
+# =============================================================================
+class ProdutoFormTests(BaseVendasTestCase):
+
+    def dados(self, **kwargs):
+        dados = {'nome': 'Caneta', 'preco': '10,50', 'estoque': '', 'marca': str(self.marca.pk)}
+        dados.update(kwargs)
+        return dados
+
+    def test_decimal_com_virgula(self):
+        campo = DecimalComVirgulaField()
+        self.assertEqual(campo.clean(' 10,50 '), Decimal('10.50'))
+        self.assertEqual(campo.clean('3.2'), Decimal('3.2'))
+
+    def test_valores_convertidos(self):
+        form = ProdutoForm(self.dados())
+        self.assertTrue(form.is_valid(), form.errors)
+        self.assertEqual(form.cleaned_data['preco'], Decimal('10.50'))
+        self.assertEqual(form.cleaned_data['estoque'], 0)
+        self.assertIsNone(form.cleaned_data['descricao'])
+        self.assertEqual(form.cleaned_data['marca'], self.marca)
+        self.assertFalse(form.cleaned_data['ativo'])
+
+    def test_mensagens_de_erro(self):
+        casos = {
+            'Nome do produto é obrigatório!': {'nome': ''},
+            'Preço do produto é obrigatório!': {'preco': ''},
+            'Preço e estoque devem ser números válidos!': {'preco': 'abc'},
+            'Preço não pode ser negativo!': {'preco': '-1'},
+            'Preço muito alto!': {'preco': '99999999999'},
+            'Preço deve ter no máximo 2 casas decimais!': {'preco': '1,555'},
+            'Estoque não pode ser negativo!': {'estoque': '-1'},
+        }
+        for mensagem, dados in casos.items():
+            with self.subTest(mensagem=mensagem):
+                form = ProdutoForm(self.dados(**dados))
+                self.assertFalse(form.is_valid())
+                self.assertEqual(form.primeiro_erro(), mensagem)
+
+    def test_marca_vem_do_cache(self):
+        ProdutoForm(self.dados()).is_valid()
+        with self.assertNumQueries(0):
+            form = ProdutoForm(self.dados())
+            self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['marca'], self.marca)
+
+
+# =============================================================================
+# TESTES: Exportação de clientes (views.clientes_exportar_csv)
+# =============================================================================
+class ClientesCsvTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.usuario)
+        self.url = reverse('vendas:clientes_exportar_csv')
+        Client.objects.create(usuario=self.usuario, nome='Maria Souza', email='maria@exemplo.com', cidade='Recife')
+        Client.objects.create(usuario=self.usuario, nome='Inativo', ativo=False)
+        outro = User.objects.create_user('bia', 'bia@exemplo.com', 'senha-forte-123')
+        Client.objects.create(usuario=outro, nome='Cliente da Bia')
+
+    def linhas(self, resposta):
+        conteudo = b''.join(resposta.streaming_content).decode('utf-8')
+        return conteudo.splitlines()
+
+    def test_exporta_em_streaming_com_uma_consulta(self):
+        # Sessão + usuário + clientes (lidos enquanto a resposta é enviada)
+        with self.assertNumQueries(3):
+            resposta = self.client.get(self.url)
+            linhas = self.linhas(resposta)
+
+        self.assertTrue(resposta.streaming)
+        self.assertEqual(resposta['Content-Disposition'], 'attachment; filename="clientes.csv"')
+        self.assertEqual(linhas[0], 'Nome;Email;Telefone;CPF/CNPJ;Endereço;Cidade;Estado;CEP;Ativo')
+        self.assertCountEqual(linhas[1:], [
+            'Maria Souza;maria@exemplo.com;;;;Recife;;;Sim',
+            'Cliente Teste;;;;;;;;Sim',
+        ])
+
+    def test_usa_os_filtros_da_listagem(self):
+        linhas = self.linhas(self.client.get(self.url, {'status': 'inativo'}))
+        self.assertEqual(linhas[1:], ['Inativo;;;;;;;;Não'])
+
+        linhas = self.linhas(self.client.get(self.url, {'status': 'todos', 'busca': 'maria'}))
+        self.assertEqual(linhas[1:], ['Maria Souza;maria@exemplo.com;;;;Recife;;;Sim'])
+
+
+# =============================================================================
+# TESTES: Registro de usuário (views.registro_view)
+# =============================================================================
+class RegistroTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('vendas:registro')
+
+    def dados(self, **kwargs):
+        dados = {
+            'nome_completo': 'Carla Dias Lima', 'email': 'Carla@Exemplo.com',
+            'senha': 'senha-forte-123', 'confirmar_senha': 'senha-forte-123',
+        }
+        dados.update(kwargs)
+        return dados
+
+    def test_cria_usuario_com_email_em_minusculas(self):
+        self.client.post(self.url, self.dados())
+        usuario = User.objects.get()
+        self.assertEqual(usuario.username, 'carla')
+        self.assertEqual(usuario.email, 'carla@exemplo.com')
+        self.assertEqual((usuario.first_name, usuario.last_name), ('Carla', 'Dias Lima'))
+        self.assertTrue(usuario.check_password('senha-forte-123'))
+
+    def test_username_em_uso_recebe_sufixo_em_uma_tentativa(self):
+        User.objects.create_user('carla', 'outra@exemplo.com', 'senha-forte-123')
+        self.client.post(self.url, self.dados())
+        usuario = User.objects.get(email='carla@exemplo.com')
+        self.assertRegex(usuario.username, r'^carla[0-9a-f]{6}$')
+
+    def test_email_ja_cadastrado_e_recusado_pelo_banco(self):
+        User.objects.create_user('carla', 'carla@exemplo.com', 'senha-forte-123')
+        resposta = self.client.post(self.url, self.dados(email='CARLA@exemplo.com'), follow=True)
+        self.assertContains(resposta, 'Este email já está cadastrado!')
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_sucesso_redireciona_para_o_login(self):
+        resposta = self.client.post(self.url, self.dados())
+        self.assertRedirects(resposta, reverse('vendas:login'), fetch_redirect_response=False)
+
+    def test_erros_voltam_ao_formulario_por_redirect(self):
+        casos = {
+            'Todos os campos são obrigatórios!': {'nome_completo': ''},
+            'A senha deve ter no mínimo 6 caracteres!': {'senha': '123', 'confirmar_senha': '123'},
+            'Informe um email válido!': {'email': 'invalido'},
+            'As senhas não conferem!': {'confirmar_senha': 'outra-senha-123'},
+        }
+        for mensagem, dados in casos.items():
+            with self.subTest(mensagem=mensagem):
+                # Post/Redirect/Get: o POST com erro não renderiza a página
+                resposta = self.client.post(self.url, self.dados(**dados))
+                self.assertRedirects(resposta, self.url, fetch_redirect_response=False)
+                self.assertContains(self.client.get(self.url), mensagem)
+        self.assertFalse(User.objects.exists())
+
+
+# =============================================================================
+# TESTES: Comando criar_marcas
+# =============================================================================
+class CriarMarcasCommandTests(TestCase):
+
+    def executar(self):
+        saida = StringIO()
+        call_command('criar_marcas', stdout=saida)
+        return saida.getvalue()
+
+    def test_insere_as_marcas_com_uma_consulta(self):
+        Marca.objects.create(nome='Avon')
+        with self.assertNumQueries(1):
+            saida = self.executar()
+        self.assertCountEqual(
+            Marca.objects.values_list('nome', flat=True),
+            ['Natura', 'Boticário', 'Racco', 'Avon'],
+        )
+        self.assertIn('Marca "Natura" criada com sucesso', saida)
+        self.assertIn('Marca "Avon" já existe', saida)
+
+    def test_pode_ser_executado_novamente(self):
+        self.executar()
+        saida = self.executar()
+        self.assertEqual(Marca.objects.count(), 4)
+        self.assertEqual(saida.count('já existe'), 4)
+
+    def test_limpa_o_cache_de_marcas(self):
+        cache.set(CHAVE_MARCAS, [])
+        self.executar()
+        self.assertIsNone(cache.get(CHAVE_MARCAS))
+
+
+# =============================================================================
+# TESTES: Colunas adiadas (defer) no admin
+# =============================================================================
+class AdminDeferTests(BaseVendasTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@exemplo.com', 'senha-forte-123'))
+
+    def consultas_adiadas(self, url):
+        with CaptureQueriesContext(connection) as consultas:
+            resposta = self.client.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        # Um SELECT só do id e do campo é a carga tardia de um campo adiado
+        return [
+            q['sql'] for q in consultas.captured_queries
+            if re.match(r'SELECT "\w+"\."id", "\w+"\."(descricao|observacoes)" FROM', q['sql'])
+        ]
+
+    def test_formularios_de_edicao_nao_adiam_campos_exibidos(self):
+        conta_pagar = AccountsPayable.objects.create(
+            usuario=self.usuario, descricao='Aluguel', valor=Decimal('10.00'), data_vencimento=date(2024, 1, 10),
+        )
+        conta_receber = AccountsReceivable.objects.create(
+            usuario=self.usuario, venda=self.criar_venda(), cliente=self.cliente,
+            valor=Decimal('10.00'), data_vencimento=date(2024, 1, 10),
+        )
+        urls = [
+            reverse('admin:vendas_product_change', args=[self.produto.pk]),
+            reverse('admin:vendas_accountspayable_change', args=[conta_pagar.pk]),
+            reverse('admin:vendas_accountsreceivable_change', args=[conta_receber.pk]),
+            reverse('admin:vendas_product_changelist'),
+            reverse('admin:vendas_accountspayable_changelist'),
+            reverse('admin:vendas_accountsreceivable_changelist'),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.consultas_adiadas(url), [])
+
+
+# =============================================================================
+# TESTES: Vetor de busca da venda (somente PostgreSQL)
+# =============================================================================
+@skipUnless(connection.vendor == 'postgresql', 'Busca textual só existe no PostgreSQL')
+class VetorBuscaVendaTests(BaseVendasTestCase):
+
+    def test_salvar_venda_atualiza_o_vetor_sem_buscar_o_cliente(self):
+        venda = Sale.objects.get(pk=self.criar_venda(observacoes='entrega expressa').pk)
+        venda.observacoes = 'retirada na loja'
+        # UPDATE da venda + UPDATE do vetor (nome do cliente por subconsulta)
+        with self.assertNumQueries(2):
+            venda.save()
+        self.assertTrue(Sale.objects.filter(pk=venda.pk, search_vector='Cliente').exists())
+        self.assertTrue(Sale.objects.filter(pk=venda.pk, search_vector='loja').exists())
 
-# Create your tests here.
+    def test_salvamento_parcial_sem_campos_da_busca(self):
+        venda = self.criar_venda()
+        with self.assertNumQueries(1):
+            venda.save(update_fields=['valor_total'])
@@ -26,6 +26,7 @@ urlpatterns = [
      # Clientes
     path('clientes/', views.clientes_list, name='clientes_list'),
     path('clientes/novo/', views.cliente_create, name='cliente_create'),
+    path('clientes/exportar/', views.clientes_exportar_csv, name='clientes_exportar_csv'),
     path('clientes/<int:pk>/editar/', views.cliente_edit, name='cliente_edit'),
     path('clientes/<int:pk>/deletar/', views.cliente_delete, name='cliente_delete'),
     path('clientes/<int:pk>/', views.cliente_detail, name='cliente_detail'),
@@ -11,17 +11,114 @@ Descrição: Aqui processamos as requisições e retornamos as respostas
 =============================================================================
 """
 
-from django.shortcuts import render, redirect
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.views.decorators.http import require_http_methods
-from django.db.models import Sum, Q
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, Count, F, Q
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.core.validators import DecimalValidator, validate_email
+from django.http import FileResponse, Http404, StreamingHttpResponse
 from django.utils import timezone
-from datetime import timedelta
+from calendar import monthrange
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+import csv
+import secrets
 
-from .models import Client, Product, Sale, SaleItem, AccountsReceivable, AccountsPayable, Marca
+from .models import (
+    Client, Product, Sale, SaleItem, AccountsReceivable, AccountsPayable,
+    marcas_em_cache, clientes_ativos_em_cache,
+)
+from .forms import ProdutoForm
+from .pdf import gerar_pdf_venda
+from .cache import DASHBOARD_TIMEOUT, chave_dashboard, invalidar_dashboard
+
+# Quantidade de registros por página nas listagens
+REGISTROS_POR_PAGINA = 50
+
+# Quantidade de linhas lidas do banco por vez nas exportações CSV
+CSV_CHUNK_SIZE = 2000
+
+# Tamanho máximo de um endereço de email válido (RFC 5321)
+EMAIL_TAMANHO_MAXIMO = 254
+
+
+def _paginar(request, consulta, total=None):
+    """
+    Pagina a consulta conforme o parâmetro page da URL, buscando no banco
+    apenas os registros da página atual.
+
+    Args:
+        total: Quantidade de registros, se já calculada pela view (evita
+            o SELECT COUNT(*) do Paginator)
+
+    Returns:
+        (pagina, filtros_url): a página e a query string dos filtros ativos
+        (sem o page), usada nos links de paginação
+    """
+    paginator = Paginator(consulta, REGISTROS_POR_PAGINA)
+    if total is not None:
+        paginator.count = total
+    pagina = paginator.get_page(request.GET.get('page'))
+    filtros = request.GET.copy()
+    filtros.pop('page', None)
+    return pagina, filtros.urlencode()
+
+
+def _inicio_do_dia(data):
+    """
+    Converte uma data no datetime (com fuso) da meia-noite desse dia.
+
+    Filtrar campos DateTimeField por esse limite (data_venda__gte=...) em
+    vez de data_venda__date__gte=data evita converter cada linha para date
+    no banco, permitindo usar o índice da coluna.
+    """
+    return timezone.make_aware(datetime.combine(data, time.min))
+
+
+def _somar_meses(data, meses):
+    """
+    Soma meses a uma data. Se o dia não existir no mês de destino
+    (ex.: 31 de fevereiro), usa o último dia desse mês.
+    """
+    ano, mes = divmod(data.month - 1 + meses, 12)
+    ano += data.year
+    mes += 1
+    return data.replace(year=ano, month=mes, day=min(data.day, monthrange(ano, mes)[1]))
+
+
+def _cabe_no_campo(valor, modelo, nome_campo):
+    """
+    Indica se o valor decimal cabe no DecimalField do modelo (max_digits e
+    decimal_places), evitando o InvalidOperation ao gravar.
+    """
+    campo = modelo._meta.get_field(nome_campo)
+    try:
+        DecimalValidator(campo.max_digits, campo.decimal_places)(valor)
+    except ValidationError:
+        return False
+    return True
+
+
+def _email_valido(email):
+    """
+    Verifica o formato do email sem acessar o banco. Usado no login e no
+    registro para recusar entradas malformadas (robôs, varreduras) antes
+    de qualquer consulta ou cálculo de hash de senha.
+    """
+    if len(email) > EMAIL_TAMANHO_MAXIMO:
+        return False
+    try:
+        validate_email(email)
+    except ValidationError:
+        return False
+    return True
 
 
 # =============================================================================
@@ -53,19 +150,18 @@ def login_view(request):
             messages.error(request, 'Email e senha são obrigatórios!')
             return render(request, 'vendas/login.html')
 
-        try:
-            # Busca o usuário pelo email
-            usuario = User.objects.get(email=email)
-            # Autentica com o username
-            user = authenticate(request, username=usuario.username, password=senha)
-
-            if user is not None:
-                login(request, user)
-                messages.success(request, f'Bem-vindo, {user.first_name or user.username}!')
-                return redirect('vendas:home')
-            else:
-                messages.error(request, 'Email ou senha incorretos!')
-        except User.DoesNotExist:
+        if not _email_valido(email):
+            messages.error(request, 'Informe um email válido!')
+            return render(request, 'vendas/login.html')
+
+        # Autentica pelo email (vendas.backends.EmailBackend)
+        user = authenticate(request, email=email, password=senha)
+
+        if user is not None:
+            login(request, user)
+            messages.success(request, f'Bem-vindo, {user.first_name or user.username}!')
+            return redirect('vendas:home')
+        else:
             messages.error(request, 'Email ou senha incorretos!')
 
     return render(request, 'vendas/login.html')
@@ -80,7 +176,8 @@ def registro_view(request):
     View para registrar um novo usuário.
     
     GET: Retorna a página de registro
-    POST: Cria um novo usuário
+    POST: Cria um novo usuário (em caso de erro, volta ao formulário via
+          redirect com a mensagem — Post/Redirect/Get)
     
     Contexto:
         - Nenhum contexto especial
@@ -93,53 +190,62 @@ def registro_view(request):
 
     if request.method == 'POST':
         nome_completo = request.POST.get('nome_completo', '').strip()
-        email = request.POST.get('email', '').strip()
+        # Email sempre gravado em minúsculas (índice único em LOWER(email))
+        email = request.POST.get('email', '').strip().lower()
         senha = request.POST.get('senha', '').strip()
         confirmar_senha = request.POST.get('confirmar_senha', '').strip()
 
         # Validações
         if not nome_completo or not email or not senha or not confirmar_senha:
             messages.error(request, 'Todos os campos são obrigatórios!')
-            return render(request, 'vendas/registro.html')
+            return redirect('vendas:registro')
 
         if len(senha) < 6:
             messages.error(request, 'A senha deve ter no mínimo 6 caracteres!')
-            return render(request, 'vendas/registro.html')
+            return redirect('vendas:registro')
+
+        if not _email_valido(email):
+            messages.error(request, 'Informe um email válido!')
+            return redirect('vendas:registro')
 
         if senha != confirmar_senha:
             messages.error(request, 'As senhas não conferem!')
-            return render(request, 'vendas/registro.html')
-
-        # Verifica se o email já existe
-        if User.objects.filter(email=email).exists():
-            messages.error(request, 'Este email já está cadastrado!')
-            return render(request, 'vendas/registro.html')
+            return redirect('vendas:registro')
 
         try:
             # Cria o novo usuário
             # O username será gerado a partir do email
             username = email.split('@')[0]
-            
-            # Se o username já existe, adiciona um número
-            contador = 1
-            username_original = username
-            while User.objects.filter(username=username).exists():
-                username = f"{username_original}{contador}"
-                contador += 1
-
-            usuario = User.objects.create_user(
-                username=username,
-                email=email,
-                password=senha,
-                first_name=nome_completo.split()[0],  # Primeiro nome
-                last_name=' '.join(nome_completo.split()[1:]) if len(nome_completo.split()) > 1 else ''
-            )
+            partes_nome = nome_completo.split()
+            dados_usuario = {
+                'email': email,
+                'password': senha,
+                'first_name': partes_nome[0],  # Primeiro nome
+                'last_name': ' '.join(partes_nome[1:]) if len(partes_nome) > 1 else '',
+            }
+
+            try:
+                # Savepoint: se o username já existir, a transação continua válida
+                with transaction.atomic():
+                    usuario = User.objects.create_user(username=username, **dados_usuario)
+            except IntegrityError:
+                # O índice único de email (migração 0009) recusou o cadastro
+                if User.objects.filter(email=email).exists():
+                    messages.error(request, 'Este email já está cadastrado!')
+                    return redirect('vendas:registro')
+
+                # Username já existe: tenta uma única vez com sufixo aleatório
+                usuario = User.objects.create_user(
+                    username=f"{username}{secrets.token_hex(3)}",
+                    **dados_usuario
+                )
 
             messages.success(request, 'Cadastro realizado com sucesso! Faça login para continuar.')
             return redirect('vendas:login')
 
         except Exception as e:
             messages.error(request, f'Erro ao criar usuário: {str(e)}')
+            return redirect('vendas:registro')
 
     return render(request, 'vendas/registro.html')
 
@@ -162,6 +268,72 @@ def logout_view(request):
 # =============================================================================
 # VIEW: Home (Dashboard)
 # =============================================================================
+def _calcular_resumo_dashboard(usuario, hoje):
+    """
+    Calcula os totais exibidos no dashboard do usuário.
+    """
+    # Dados do usuário
+    total_clientes = Client.objects.filter(usuario=usuario, ativo=True).count()
+    total_produtos = Product.objects.filter(usuario=usuario, ativo=True).count()
+
+    # Vendas do mês (quantidade e valor em uma única consulta).
+    # Compara data_venda com um datetime (e não data_venda__date) para que o
+    # banco use o índice (usuario, data_venda) em vez de converter cada linha.
+    inicio_mes = _inicio_do_dia(hoje.replace(day=1))
+    totais_vendas_mes = Sale.objects.filter(
+        usuario=usuario,
+        data_venda__gte=inicio_mes
+    ).aggregate(
+        total=Count('id'),
+        valor=Sum('valor_total'),
+    )
+    total_vendas_mes = totais_vendas_mes['total']
+    valor_vendas_mes = totais_vendas_mes['valor'] or 0
+
+    # Contas a receber (uma única consulta com agregações condicionais).
+    # Vencida/pendente é decidido pela data de vencimento, e não pela coluna
+    # status, para o resumo ficar correto mesmo antes de o comando diário
+    # (atualizar_status_contas) rodar; só as contas não pagas entram.
+    filtro_vencidas = Q(data_vencimento__lt=hoje)
+    filtro_hoje = Q(data_vencimento=hoje)
+    filtro_pendentes = Q(data_vencimento__gte=hoje)
+    totais_receber = AccountsReceivable.objects.filter(
+        usuario=usuario, status__in=['pendente', 'vencido']
+    ).aggregate(
+        vencidas=Sum('valor', filter=filtro_vencidas),
+        hoje=Sum('valor', filter=filtro_hoje),
+        pendentes=Count('id', filter=filtro_pendentes),
+    )
+    contas_receber_vencidas = totais_receber['vencidas'] or 0
+    contas_receber_hoje = totais_receber['hoje'] or 0
+    contas_receber_pendentes = totais_receber['pendentes']
+
+    # Contas a pagar (uma única consulta com agregações condicionais)
+    totais_pagar = AccountsPayable.objects.filter(
+        usuario=usuario, status__in=['pendente', 'vencido']
+    ).aggregate(
+        vencidas=Sum('valor', filter=filtro_vencidas),
+        hoje=Sum('valor', filter=filtro_hoje),
+        pendentes=Count('id', filter=filtro_pendentes),
+    )
+    contas_pagar_vencidas = totais_pagar['vencidas'] or 0
+    contas_pagar_hoje = totais_pagar['hoje'] or 0
+    contas_pagar_pendentes = totais_pagar['pendentes']
+
+    return {
+        'total_clientes': total_clientes,
+        'total_produtos': total_produtos,
+        'total_vendas_mes': total_vendas_mes,
+        'valor_vendas_mes': valor_vendas_mes,
+        'contas_receber_vencidas': contas_receber_vencidas,
+        'contas_receber_hoje': contas_receber_hoje,
+        'contas_receber_pendentes': contas_receber_pendentes,
+        'contas_pagar_vencidas': contas_pagar_vencidas,
+        'contas_pagar_hoje': contas_pagar_hoje,
+        'contas_pagar_pendentes': contas_pagar_pendentes,
+    }
+
+
 @login_required(login_url='vendas:login')
 def home_view(request):
     """
@@ -185,63 +357,13 @@ def home_view(request):
     usuario = request.user
     hoje = timezone.now().date()
 
-    # Dados do usuário
-    total_clientes = Client.objects.filter(usuario=usuario, ativo=True).count()
-    total_produtos = Product.objects.filter(usuario=usuario, ativo=True).count()
-
-    # Vendas do mês
-    primeiro_dia_mes = hoje.replace(day=1)
-    vendas_mes = Sale.objects.filter(
-        usuario=usuario,
-        data_venda__date__gte=primeiro_dia_mes
+    # O resumo fica em cache por usuário; a chave muda sempre que os dados
+    # do usuário são alterados (ver vendas/cache.py e vendas/signals.py)
+    contexto = cache.get_or_set(
+        chave_dashboard(usuario.id, hoje),
+        lambda: _calcular_resumo_dashboard(usuario, hoje),
+        DASHBOARD_TIMEOUT
     )
-    total_vendas_mes = vendas_mes.count()
-    valor_vendas_mes = vendas_mes.aggregate(Sum('valor_total'))['valor_total__sum'] or 0
-
-    # Contas a receber
-    contas_receber = AccountsReceivable.objects.filter(usuario=usuario)
-    
-    contas_receber_vencidas = contas_receber.filter(
-        status='vencido'
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    contas_receber_hoje = contas_receber.filter(
-        data_vencimento=hoje,
-        status__in=['pendente', 'vencido']
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    contas_receber_pendentes = contas_receber.filter(
-        status='pendente'
-    ).count()
-
-    # Contas a pagar
-    contas_pagar = AccountsPayable.objects.filter(usuario=usuario)
-    
-    contas_pagar_vencidas = contas_pagar.filter(
-        status='vencido'
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    contas_pagar_hoje = contas_pagar.filter(
-        data_vencimento=hoje,
-        status__in=['pendente', 'vencido']
-    ).aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    contas_pagar_pendentes = contas_pagar.filter(
-        status='pendente'
-    ).count()
-
-    contexto = {
-        'total_clientes': total_clientes,
-        'total_produtos': total_produtos,
-        'total_vendas_mes': total_vendas_mes,
-        'valor_vendas_mes': valor_vendas_mes,
-        'contas_receber_vencidas': contas_receber_vencidas,
-        'contas_receber_hoje': contas_receber_hoje,
-        'contas_receber_pendentes': contas_receber_pendentes,
-        'contas_pagar_vencidas': contas_pagar_vencidas,
-        'contas_pagar_hoje': contas_pagar_hoje,
-        'contas_pagar_pendentes': contas_pagar_pendentes,
-    }
 
     return render(request, 'vendas/home.html', contexto)
 
@@ -249,21 +371,14 @@ def home_view(request):
 # VIEWS: CLIENTES
 # =============================================================================
 
-@login_required(login_url='vendas:login')
-def clientes_list(request):
+def _filtrar_clientes(request, usuario):
     """
-    View para listar todos os clientes do usuário.
-    
-    GET: Retorna a lista de clientes
-    
-    Contexto:
-        - clientes: Lista de clientes do usuário
-        - total_clientes: Total de clientes
-    
-    Template: clientes/list.html
+    Monta a consulta de clientes do usuário com os filtros da listagem
+    (status e busca por nome), usada pela lista e pela exportação CSV.
+
+    Returns:
+        (clientes, status, busca)
     """
-    usuario = request.user
-    
     # Busca todos os clientes do usuário
     clientes = Client.objects.filter(usuario=usuario).order_by('-criado_em')
     
@@ -278,10 +393,49 @@ def clientes_list(request):
     busca = request.GET.get('busca', '').strip()
     if busca:
         clientes = clientes.filter(nome__icontains=busca)
+
+    return clientes, status, busca
+
+
+class _Eco:
+    """
+    Pseudo-buffer para o csv.writer: em vez de guardar a linha, devolve o
+    texto escrito, para que cada linha seja enviada direto na resposta.
+    """
+
+    def write(self, valor):
+        return valor
+
+
+@login_required(login_url='vendas:login')
+def clientes_list(request):
+    """
+    View para listar todos os clientes do usuário.
+    
+    GET: Retorna a lista de clientes
+    
+    Contexto:
+        - clientes: Página atual de clientes do usuário
+        - page_obj / filtros_url: Para os links de paginação
+        - total_clientes: Total de clientes
+    
+    Template: clientes/list.html
+    """
+    usuario = request.user
     
+    clientes, status, busca = _filtrar_clientes(request, usuario)
+    
+    # Paginação: busca só a página atual e apenas as colunas exibidas
+    pagina, filtros_url = _paginar(
+        request,
+        clientes.only('id', 'nome', 'email', 'telefone', 'cpf_cnpj', 'ativo', 'criado_em')
+    )
+
     contexto = {
-        'clientes': clientes,
-        'total_clientes': clientes.count(),
+        'clientes': pagina,
+        'page_obj': pagina,
+        'filtros_url': filtros_url,
+        'total_clientes': pagina.paginator.count,
         'status_filtro': status,
         'busca': busca,
     }
@@ -289,13 +443,43 @@ def clientes_list(request):
     return render(request, 'vendas/clientes/list.html', contexto)
 
 
+@login_required(login_url='vendas:login')
+def clientes_exportar_csv(request):
+    """
+    View para exportar os clientes do usuário em CSV.
+    
+    GET: Retorna o arquivo CSV com os mesmos filtros da listagem
+    
+    As linhas são lidas do banco em blocos (iterator) e enviadas aos poucos
+    (StreamingHttpResponse), sem carregar todos os clientes na memória.
+    """
+    usuario = request.user
+    
+    clientes, _, _ = _filtrar_clientes(request, usuario)
+    colunas = ['nome', 'email', 'telefone', 'cpf_cnpj', 'endereco', 'cidade', 'estado', 'cep', 'ativo']
+    linhas = clientes.values_list(*colunas).iterator(chunk_size=CSV_CHUNK_SIZE)
+    
+    escritor = csv.writer(_Eco(), delimiter=';')
+    
+    def gerar_linhas():
+        yield escritor.writerow(['Nome', 'Email', 'Telefone', 'CPF/CNPJ', 'Endereço', 'Cidade', 'Estado', 'CEP', 'Ativo'])
+        for linha in linhas:
+            *dados, ativo = linha
+            yield escritor.writerow([valor or '' for valor in dados] + ['Sim' if ativo else 'Não'])
+    
+    response = StreamingHttpResponse(gerar_linhas(), content_type='text/csv; charset=utf-8')
+    response['Content-Disposition'] = 'attachment; filename="clientes.csv"'
+    return response
+
+
 @login_required(login_url='vendas:login')
 def cliente_create(request):
     """
     View para criar um novo cliente.
     
     GET: Retorna o formulário de criação
-    POST: Cria um novo cliente
+    POST: Cria um novo cliente (em caso de erro, volta ao formulário via
+          redirect com a mensagem — Post/Redirect/Get)
     
     Contexto:
         - Nenhum contexto especial
@@ -317,32 +501,34 @@ def cliente_create(request):
         # Validações
         if not nome:
             messages.error(request, 'Nome do cliente é obrigatório!')
-            return render(request, 'vendas/clientes/form.html')
-        
-        # Verifica se já existe um cliente com o mesmo nome
-        if Client.objects.filter(usuario=usuario, nome=nome).exists():
-            messages.error(request, 'Já existe um cliente com este nome!')
-            return render(request, 'vendas/clientes/form.html')
+            return redirect('vendas:cliente_create')
         
         try:
-            # Cria o novo cliente
-            cliente = Client.objects.create(
-                usuario=usuario,
-                nome=nome,
-                email=email if email else None,
-                telefone=telefone if telefone else None,
-                cpf_cnpj=cpf_cnpj if cpf_cnpj else None,
-                endereco=endereco if endereco else None,
-                cidade=cidade if cidade else None,
-                estado=estado if estado else None,
-                cep=cep if cep else None,
-            )
+            # Cria o novo cliente. O nome repetido é recusado pelo próprio
+            # banco (unique_together usuario/nome), sem um SELECT antes.
+            try:
+                with transaction.atomic():
+                    cliente = Client.objects.create(
+                        usuario=usuario,
+                        nome=nome,
+                        email=email if email else None,
+                        telefone=telefone if telefone else None,
+                        cpf_cnpj=cpf_cnpj if cpf_cnpj else None,
+                        endereco=endereco if endereco else None,
+                        cidade=cidade if cidade else None,
+                        estado=estado if estado else None,
+                        cep=cep if cep else None,
+                    )
+            except IntegrityError:
+                messages.error(request, 'Já existe um cliente com este nome!')
+                return redirect('vendas:cliente_create')
             
             messages.success(request, f'Cliente "{nome}" criado com sucesso!')
             return redirect('vendas:clientes_list')
         
         except Exception as e:
             messages.error(request, f'Erro ao criar cliente: {str(e)}')
+            return redirect('vendas:cliente_create')
     
     return render(request, 'vendas/clientes/form.html')
 
@@ -365,11 +551,7 @@ def cliente_edit(request, pk):
     """
     usuario = request.user
     
-    try:
-        cliente = Client.objects.get(pk=pk, usuario=usuario)
-    except Client.DoesNotExist:
-        messages.error(request, 'Cliente não encontrado!')
-        return redirect('vendas:clientes_list')
+    cliente = get_object_or_404(Client, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         nome = request.POST.get('nome', '').strip()
@@ -388,24 +570,35 @@ def cliente_edit(request, pk):
             contexto = {'cliente': cliente, 'edicao': True}
             return render(request, 'vendas/clientes/form.html', contexto)
         
-        # Verifica se já existe outro cliente com o mesmo nome
-        if Client.objects.filter(usuario=usuario, nome=nome).exclude(pk=pk).exists():
-            messages.error(request, 'Já existe outro cliente com este nome!')
-            contexto = {'cliente': cliente, 'edicao': True}
-            return render(request, 'vendas/clientes/form.html', contexto)
-        
         try:
-            # Atualiza o cliente
-            cliente.nome = nome
-            cliente.email = email if email else None
-            cliente.telefone = telefone if telefone else None
-            cliente.cpf_cnpj = cpf_cnpj if cpf_cnpj else None
-            cliente.endereco = endereco if endereco else None
-            cliente.cidade = cidade if cidade else None
-            cliente.estado = estado if estado else None
-            cliente.cep = cep if cep else None
-            cliente.ativo = ativo
-            cliente.save()
+            # Atualiza o cliente, gravando apenas as colunas que mudaram
+            novos_valores = {
+                'nome': nome,
+                'email': email if email else None,
+                'telefone': telefone if telefone else None,
+                'cpf_cnpj': cpf_cnpj if cpf_cnpj else None,
+                'endereco': endereco if endereco else None,
+                'cidade': cidade if cidade else None,
+                'estado': estado if estado else None,
+                'cep': cep if cep else None,
+                'ativo': ativo,
+            }
+            campos_alterados = []
+            for campo, valor in novos_valores.items():
+                if getattr(cliente, campo) != valor:
+                    setattr(cliente, campo, valor)
+                    campos_alterados.append(campo)
+
+            if campos_alterados:
+                # atualizado_em (auto_now) só é gravado se estiver na lista.
+                # O nome repetido é recusado pelo banco (unique_together).
+                try:
+                    with transaction.atomic():
+                        cliente.save(update_fields=campos_alterados + ['atualizado_em'])
+                except IntegrityError:
+                    messages.error(request, 'Já existe outro cliente com este nome!')
+                    contexto = {'cliente': cliente, 'edicao': True}
+                    return render(request, 'vendas/clientes/form.html', contexto)
             
             messages.success(request, f'Cliente "{nome}" atualizado com sucesso!')
             return redirect('vendas:clientes_list')
@@ -436,15 +629,17 @@ def cliente_delete(request, pk):
     """
     usuario = request.user
     
-    try:
-        cliente = Client.objects.get(pk=pk, usuario=usuario)
-    except Client.DoesNotExist:
-        messages.error(request, 'Cliente não encontrado!')
-        return redirect('vendas:clientes_list')
+    cliente = get_object_or_404(Client, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         nome_cliente = cliente.nome
-        cliente.delete()
+        # A tela promete excluir o cliente com suas vendas e contas, então a
+        # exclusão continua física. As vendas (com itens e contas) saem em
+        # DELETEs diretos, sem o Collector carregar cada registro e disparar
+        # o recálculo do total da venda para cada item excluído.
+        with transaction.atomic():
+            Sale.objects.excluir_em_lote(Sale.objects.filter(cliente=cliente))
+            cliente.delete()
         messages.success(request, f'Cliente "{nome_cliente}" deletado com sucesso!')
         return redirect('vendas:clientes_list')
     
@@ -475,16 +670,15 @@ def cliente_detail(request, pk):
     """
     usuario = request.user
     
-    try:
-        cliente = Client.objects.get(pk=pk, usuario=usuario)
-    except Client.DoesNotExist:
-        messages.error(request, 'Cliente não encontrado!')
-        return redirect('vendas:clientes_list')
+    cliente = get_object_or_404(Client, pk=pk, usuario=usuario)
     
-    # Dados do cliente
-    vendas = Sale.objects.filter(usuario=usuario, cliente=cliente)
-    total_vendas = vendas.count()
-    valor_total_vendas = vendas.aggregate(Sum('valor_total'))['valor_total__sum'] or 0
+    # Dados do cliente (quantidade e valor das vendas em uma única consulta)
+    totais_vendas = Sale.objects.filter(usuario=usuario, cliente=cliente).aggregate(
+        total=Count('id'),
+        valor=Sum('valor_total'),
+    )
+    total_vendas = totais_vendas['total']
+    valor_total_vendas = totais_vendas['valor'] or 0
     
     # Contas a receber
     contas_receber = AccountsReceivable.objects.filter(
@@ -513,7 +707,8 @@ def produtos_list(request):
     GET: Retorna a lista de produtos
     
     Contexto:
-        - produtos: Lista de produtos do usuário
+        - produtos: Página atual de produtos do usuário
+        - page_obj / filtros_url: Para os links de paginação
         - total_produtos: Total de produtos
         - marcas: Lista de marcas para filtro
     
@@ -521,34 +716,44 @@ def produtos_list(request):
     """
     usuario = request.user
     
-    # Busca todos os produtos do usuário
-    produtos = Product.objects.filter(usuario=usuario).order_by('-criado_em')
+    # Monta todas as condições antes e aplica um único filter()
+    filtros = {'usuario': usuario}
+    condicao = Q()
     
     # Filtro por status (ativo/inativo)
     status = request.GET.get('status', 'ativo')
     if status == 'ativo':
-        produtos = produtos.filter(ativo=True)
+        filtros['ativo'] = True
     elif status == 'inativo':
-        produtos = produtos.filter(ativo=False)
+        filtros['ativo'] = False
     
     # Filtro por marca
     marca_id = request.GET.get('marca', '')
     if marca_id:
-        produtos = produtos.filter(marca_id=marca_id)
+        filtros['marca_id'] = marca_id
     
     # Busca por nome
     busca = request.GET.get('busca', '').strip()
     if busca:
-        produtos = produtos.filter(
-            Q(nome__icontains=busca) | Q(descricao__icontains=busca)
-        )
+        condicao = Q(nome__icontains=busca) | Q(descricao__icontains=busca)
+    
+    # Produtos do usuário com a marca na mesma consulta (apenas as colunas
+    # exibidas na lista; a descrição só é usada no filtro de busca)
+    produtos = Product.objects.filter(condicao, **filtros).select_related('marca').only(
+        'id', 'nome', 'preco', 'estoque', 'ativo', 'marca__nome', 'criado_em'
+    ).order_by('-criado_em')
     
     # Marcas para filtro
-    marcas = Marca.objects.all()
+    marcas = marcas_em_cache()
+    
+    # Paginação: busca só a página atual
+    pagina, filtros_url = _paginar(request, produtos)
     
     contexto = {
-        'produtos': produtos,
-        'total_produtos': produtos.count(),
+        'produtos': pagina,
+        'page_obj': pagina,
+        'filtros_url': filtros_url,
+        'total_produtos': pagina.paginator.count,
         'status_filtro': status,
         'marca_filtro': marca_id,
         'busca': busca,
@@ -572,72 +777,37 @@ def produto_create(request):
     Template: produtos/form.html
     """
     usuario = request.user
-    marcas = Marca.objects.all()
+    marcas = marcas_em_cache()
     
     if request.method == 'POST':
-        nome = request.POST.get('nome', '').strip()
-        descricao = request.POST.get('descricao', '').strip()
-        preco = request.POST.get('preco', '').strip()
-        marca_id = request.POST.get('marca', '')
-        estoque = request.POST.get('estoque', '0').strip()
-        
-        # Validações
-        if not nome:
-            messages.error(request, 'Nome do produto é obrigatório!')
+        # Lê, converte e valida todos os campos de uma vez
+        form = ProdutoForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, form.primeiro_erro())
             contexto = {'marcas': marcas}
             return render(request, 'vendas/produtos/form.html', contexto)
+        dados = form.cleaned_data
+        nome = dados['nome']
         
-        if not preco:
-            messages.error(request, 'Preço do produto é obrigatório!')
-            contexto = {'marcas': marcas}
-            return render(request, 'vendas/produtos/form.html', contexto)
-        
-        # Verifica se já existe um produto com o mesmo nome
-        if Product.objects.filter(usuario=usuario, nome=nome).exists():
+        # Cria o novo produto; o nome repetido é recusado pelo próprio banco
+        # (unique_together usuario/nome), sem um SELECT antes
+        try:
+            with transaction.atomic():
+                Product.objects.create(
+                    usuario=usuario,
+                    nome=nome,
+                    descricao=dados['descricao'],
+                    preco=dados['preco'],
+                    marca=dados['marca'],
+                    estoque=dados['estoque'],
+                )
+        except IntegrityError:
             messages.error(request, 'Já existe um produto com este nome!')
             contexto = {'marcas': marcas}
             return render(request, 'vendas/produtos/form.html', contexto)
         
-        try:
-            # Converte valores
-            preco = float(preco.replace(',', '.'))
-            estoque = int(estoque) if estoque else 0
-            
-            # Valida valores
-            if preco < 0:
-                messages.error(request, 'Preço não pode ser negativo!')
-                contexto = {'marcas': marcas}
-                return render(request, 'vendas/produtos/form.html', contexto)
-            
-            if estoque < 0:
-                messages.error(request, 'Estoque não pode ser negativo!')
-                contexto = {'marcas': marcas}
-                return render(request, 'vendas/produtos/form.html', contexto)
-            
-            # Cria o novo produto
-            marca = None
-            if marca_id:
-                try:
-                    marca = Marca.objects.get(id=marca_id)
-                except Marca.DoesNotExist:
-                    pass
-            
-            produto = Product.objects.create(
-                usuario=usuario,
-                nome=nome,
-                descricao=descricao if descricao else None,
-                preco=preco,
-                marca=marca,
-                estoque=estoque,
-            )
-            
-            messages.success(request, f'Produto "{nome}" criado com sucesso!')
-            return redirect('vendas:produtos_list')
-        
-        except ValueError:
-            messages.error(request, 'Preço e estoque devem ser números válidos!')
-        except Exception as e:
-            messages.error(request, f'Erro ao criar produto: {str(e)}')
+        messages.success(request, f'Produto "{nome}" criado com sucesso!')
+        return redirect('vendas:produtos_list')
     
     contexto = {'marcas': marcas}
     return render(request, 'vendas/produtos/form.html', contexto)
@@ -661,78 +831,44 @@ def produto_edit(request, pk):
     Template: produtos/form.html
     """
     usuario = request.user
-    marcas = Marca.objects.all()
+    marcas = marcas_em_cache()
     
-    try:
-        produto = Product.objects.get(pk=pk, usuario=usuario)
-    except Product.DoesNotExist:
-        messages.error(request, 'Produto não encontrado!')
-        return redirect('vendas:produtos_list')
+    # O formulário usa produto.marca.id: a marca vem na mesma consulta
+    produto = get_object_or_404(Product.objects.select_related('marca'), pk=pk, usuario=usuario)
     
     if request.method == 'POST':
-        nome = request.POST.get('nome', '').strip()
-        descricao = request.POST.get('descricao', '').strip()
-        preco = request.POST.get('preco', '').strip()
-        marca_id = request.POST.get('marca', '')
-        estoque = request.POST.get('estoque', '0').strip()
-        ativo = request.POST.get('ativo') == 'on'
-        
-        # Validações
-        if not nome:
-            messages.error(request, 'Nome do produto é obrigatório!')
+        # Lê, converte e valida todos os campos de uma vez
+        form = ProdutoForm(request.POST)
+        if not form.is_valid():
+            messages.error(request, form.primeiro_erro())
             contexto = {'produto': produto, 'marcas': marcas, 'edicao': True}
             return render(request, 'vendas/produtos/form.html', contexto)
+        dados = form.cleaned_data
+        nome = dados['nome']
         
-        if not preco:
-            messages.error(request, 'Preço do produto é obrigatório!')
-            contexto = {'produto': produto, 'marcas': marcas, 'edicao': True}
-            return render(request, 'vendas/produtos/form.html', contexto)
-        
-        # Verifica se já existe outro produto com o mesmo nome
-        if Product.objects.filter(usuario=usuario, nome=nome).exclude(pk=pk).exists():
+        # Um único UPDATE; o nome repetido é recusado pelo próprio banco
+        # (unique_together usuario/nome), sem um SELECT antes
+        try:
+            with transaction.atomic():
+                Product.objects.filter(pk=pk, usuario=usuario).update(
+                    nome=nome,
+                    descricao=dados['descricao'],
+                    preco=dados['preco'],
+                    marca=dados['marca'],
+                    estoque=dados['estoque'],
+                    ativo=dados['ativo'],
+                    atualizado_em=timezone.now(),
+                )
+        except IntegrityError:
             messages.error(request, 'Já existe outro produto com este nome!')
             contexto = {'produto': produto, 'marcas': marcas, 'edicao': True}
             return render(request, 'vendas/produtos/form.html', contexto)
+        # O update() não dispara signals, então o cache do dashboard
+        # (total de produtos ativos) é invalidado aqui
+        invalidar_dashboard(usuario.id)
         
-        try:
-            # Converte valores
-            preco = float(preco.replace(',', '.'))
-            estoque = int(estoque) if estoque else 0
-            
-            # Valida valores
-            if preco < 0:
-                messages.error(request, 'Preço não pode ser negativo!')
-                contexto = {'produto': produto, 'marcas': marcas, 'edicao': True}
-                return render(request, 'vendas/produtos/form.html', contexto)
-            
-            if estoque < 0:
-                messages.error(request, 'Estoque não pode ser negativo!')
-                contexto = {'produto': produto, 'marcas': marcas, 'edicao': True}
-                return render(request, 'vendas/produtos/form.html', contexto)
-            
-            # Atualiza o produto
-            marca = None
-            if marca_id:
-                try:
-                    marca = Marca.objects.get(id=marca_id)
-                except Marca.DoesNotExist:
-                    pass
-            
-            produto.nome = nome
-            produto.descricao = descricao if descricao else None
-            produto.preco = preco
-            produto.marca = marca
-            produto.estoque = estoque
-            produto.ativo = ativo
-            produto.save()
-            
-            messages.success(request, f'Produto "{nome}" atualizado com sucesso!')
-            return redirect('vendas:produtos_list')
-        
-        except ValueError:
-            messages.error(request, 'Preço e estoque devem ser números válidos!')
-        except Exception as e:
-            messages.error(request, f'Erro ao atualizar produto: {str(e)}')
+        messages.success(request, f'Produto "{nome}" atualizado com sucesso!')
+        return redirect('vendas:produtos_list')
     
     contexto = {
         'produto': produto,
@@ -758,11 +894,8 @@ def produto_delete(request, pk):
     """
     usuario = request.user
     
-    try:
-        produto = Product.objects.get(pk=pk, usuario=usuario)
-    except Product.DoesNotExist:
-        messages.error(request, 'Produto não encontrado!')
-        return redirect('vendas:produtos_list')
+    # A confirmação exibe apenas o nome (usuario_id é usado pelos signals)
+    produto = get_object_or_404(Product.objects.only('id', 'nome', 'usuario'), pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         nome_produto = produto.nome
@@ -796,16 +929,15 @@ def produto_detail(request, pk):
     """
     usuario = request.user
     
-    try:
-        produto = Product.objects.get(pk=pk, usuario=usuario)
-    except Product.DoesNotExist:
-        messages.error(request, 'Produto não encontrado!')
-        return redirect('vendas:produtos_list')
+    produto = get_object_or_404(Product.objects.select_related('marca'), pk=pk, usuario=usuario)
     
-    # Dados do produto
-    itens_venda = SaleItem.objects.filter(produto=produto)
-    total_vendas = itens_venda.count()
-    quantidade_vendida = itens_venda.aggregate(Sum('quantidade'))['quantidade__sum'] or 0
+    # Dados do produto (quantidade de vendas e unidades vendidas em uma única consulta)
+    totais_itens = SaleItem.objects.filter(produto=produto).aggregate(
+        total=Count('id'),
+        quantidade=Sum('quantidade'),
+    )
+    total_vendas = totais_itens['total']
+    quantidade_vendida = totais_itens['quantidade'] or 0
     
     contexto = {
         'produto': produto,
@@ -831,11 +963,10 @@ def produto_ajustar_estoque(request, pk):
     """
     usuario = request.user
     
-    try:
-        produto = Product.objects.get(pk=pk, usuario=usuario)
-    except Product.DoesNotExist:
-        messages.error(request, 'Produto não encontrado!')
-        return redirect('vendas:produtos_list')
+    # Apenas as colunas usadas no ajuste e na página
+    produto = get_object_or_404(
+        Product.objects.only('id', 'nome', 'estoque', 'usuario'), pk=pk, usuario=usuario
+    )
     
     if request.method == 'POST':
         operacao = request.POST.get('operacao', 'adicionar')
@@ -844,37 +975,41 @@ def produto_ajustar_estoque(request, pk):
         
         try:
             quantidade = int(quantidade)
-            
-            if quantidade <= 0:
-                messages.error(request, 'Quantidade deve ser maior que zero!')
+        except ValueError:
+            messages.error(request, 'Quantidade deve ser um número válido!')
+            contexto = {'produto': produto}
+            return render(request, 'vendas/produtos/ajustar_estoque.html', contexto)
+        
+        if quantidade <= 0:
+            messages.error(request, 'Quantidade deve ser maior que zero!')
+            contexto = {'produto': produto}
+            return render(request, 'vendas/produtos/ajustar_estoque.html', contexto)
+        
+        # Ajusta o estoque com um único UPDATE calculado no banco
+        # (F('estoque')), sem ler-alterar-gravar: ajustes simultâneos
+        # não se sobrescrevem
+        produtos = Product.objects.filter(pk=pk, usuario=usuario)
+        if operacao == 'adicionar':
+            produtos.update(estoque=F('estoque') + quantidade, atualizado_em=timezone.now())
+            mensagem = f'Adicionado {quantidade} unidade(s) ao estoque'
+        else:  # remover
+            # Só remove se houver estoque suficiente no momento do UPDATE
+            atualizados = produtos.filter(estoque__gte=quantidade).update(
+                estoque=F('estoque') - quantidade, atualizado_em=timezone.now()
+            )
+            if not atualizados:
+                produto.refresh_from_db(fields=['estoque'])
+                messages.error(request, f'Estoque insuficiente! Disponível: {produto.estoque}')
                 contexto = {'produto': produto}
                 return render(request, 'vendas/produtos/ajustar_estoque.html', contexto)
             
-            # Ajusta o estoque
-            if operacao == 'adicionar':
-                produto.estoque += quantidade
-                mensagem = f'Adicionado {quantidade} unidade(s) ao estoque'
-            else:  # remover
-                if produto.estoque < quantidade:
-                    messages.error(request, f'Estoque insuficiente! Disponível: {produto.estoque}')
-                    contexto = {'produto': produto}
-                    return render(request, 'vendas/produtos/ajustar_estoque.html', contexto)
-                
-                produto.estoque -= quantidade
-                mensagem = f'Removido {quantidade} unidade(s) do estoque'
-            
-            produto.save()
-            
-            if motivo:
-                mensagem += f' - Motivo: {motivo}'
-            
-            messages.success(request, mensagem)
-            return redirect('vendas:produto_detail', pk=pk)
+            mensagem = f'Removido {quantidade} unidade(s) do estoque'
         
-        except ValueError:
-            messages.error(request, 'Quantidade deve ser um número válido!')
-        except Exception as e:
-            messages.error(request, f'Erro ao ajustar estoque: {str(e)}')
+        if motivo:
+            mensagem += f' - Motivo: {motivo}'
+        
+        messages.success(request, mensagem)
+        return redirect('vendas:produto_detail', pk=pk)
     
     contexto = {
         'produto': produto,
@@ -894,7 +1029,8 @@ def vendas_list(request):
     GET: Retorna a lista de vendas
     
     Contexto:
-        - vendas: Lista de vendas do usuário
+        - vendas: Página atual de vendas do usuário
+        - page_obj / filtros_url: Para os links de paginação
         - total_vendas: Total de vendas
         - valor_total: Valor total de todas as vendas
     
@@ -902,18 +1038,18 @@ def vendas_list(request):
     """
     usuario = request.user
     
-    # Busca todas as vendas do usuário
-    vendas = Sale.objects.filter(usuario=usuario).order_by('-data_venda')
+    # Monta todas as condições antes e aplica um único filter()
+    filtros = {'usuario': usuario}
     
     # Filtro por cliente
     cliente_id = request.GET.get('cliente', '')
     if cliente_id:
-        vendas = vendas.filter(cliente_id=cliente_id)
+        filtros['cliente_id'] = cliente_id
     
     # Filtro por forma de pagamento
     forma_pagamento = request.GET.get('forma_pagamento', '')
     if forma_pagamento:
-        vendas = vendas.filter(forma_pagamento=forma_pagamento)
+        filtros['forma_pagamento'] = forma_pagamento
     
     # Busca por período
     data_inicio = request.GET.get('data_inicio', '')
@@ -921,27 +1057,39 @@ def vendas_list(request):
     
     if data_inicio:
         try:
-            data_inicio_obj = timezone.datetime.strptime(data_inicio, '%Y-%m-%d').date()
-            vendas = vendas.filter(data_venda__date__gte=data_inicio_obj)
-        except:
+            data_inicio_obj = date.fromisoformat(data_inicio)
+            filtros['data_venda__gte'] = _inicio_do_dia(data_inicio_obj)
+        except ValueError:
             pass
     
     if data_fim:
         try:
-            data_fim_obj = timezone.datetime.strptime(data_fim, '%Y-%m-%d').date()
-            vendas = vendas.filter(data_venda__date__lte=data_fim_obj)
-        except:
+            data_fim_obj = date.fromisoformat(data_fim)
+            filtros['data_venda__lt'] = _inicio_do_dia(data_fim_obj + timedelta(days=1))
+        except ValueError:
             pass
     
-    # Clientes para filtro
-    clientes = Client.objects.filter(usuario=usuario, ativo=True)
+    # Vendas do usuário com o cliente na mesma consulta (apenas as colunas
+    # exibidas na lista, sem observações e vetor de busca)
+    vendas = Sale.objects.filter(**filtros).select_related('cliente').only(
+        'id', 'cliente__nome', 'data_venda', 'valor_total', 'forma_pagamento', 'data_vencimento'
+    ).order_by('-data_venda')
+    
+    # Clientes para filtro (apenas id e nome, em cache por usuário)
+    clientes = clientes_ativos_em_cache(usuario.id)
     
-    # Totais
-    total_vendas = vendas.count()
-    valor_total = vendas.aggregate(Sum('valor_total'))['valor_total__sum'] or 0
+    # Totais (quantidade e valor em uma única consulta)
+    totais = vendas.aggregate(total=Count('id'), valor=Sum('valor_total'))
+    total_vendas = totais['total']
+    valor_total = totais['valor'] or 0
+    
+    # Paginação: busca só a página atual (os totais acima são de todas)
+    pagina, filtros_url = _paginar(request, vendas)
     
     contexto = {
-        'vendas': vendas,
+        'vendas': pagina,
+        'page_obj': pagina,
+        'filtros_url': filtros_url,
         'total_vendas': total_vendas,
         'valor_total': valor_total,
         'cliente_filtro': cliente_id,
@@ -970,7 +1118,8 @@ def venda_create(request):
     Template: vendas/form.html
     """
     usuario = request.user
-    clientes = Client.objects.filter(usuario=usuario, ativo=True)
+    # Clientes do formulário (apenas id e nome, em cache por usuário)
+    clientes = clientes_ativos_em_cache(usuario.id)
     produtos = Product.objects.filter(usuario=usuario, ativo=True)
     
     if request.method == 'POST':
@@ -998,15 +1147,87 @@ def venda_create(request):
             contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
             return render(request, 'vendas/vendas/form.html', contexto)
         
+        # Converte data de vencimento e parcelas
         try:
-            # Converte data de vencimento
-            data_vencimento_obj = timezone.datetime.strptime(data_vencimento, '%Y-%m-%d').date()
-            
-            # Converte parcelas
+            data_vencimento_obj = date.fromisoformat(data_vencimento)
             parcelas = int(parcelas) if parcelas else 1
-            if parcelas < 1:
-                parcelas = 1
+        except ValueError:
+            messages.error(request, 'Data de vencimento ou número de parcelas inválido!')
+            contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
+            return render(request, 'vendas/vendas/form.html', contexto)
+        if parcelas < 1:
+            parcelas = 1
+        
+        # Processa os itens da venda
+        produtos_ids = request.POST.getlist('produto_id[]')
+        quantidades = request.POST.getlist('quantidade[]')
+        precos = request.POST.getlist('preco[]')
+        
+        if not produtos_ids:
+            messages.error(request, 'Adicione pelo menos um produto à venda!')
+            contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
+            return render(request, 'vendas/vendas/form.html', contexto)
+        
+        # Busca todos os produtos informados de uma vez (em vez de um
+        # SELECT por item) e indexa pelo ID
+        ids_validos = [int(produto_id) for produto_id in produtos_ids if produto_id.isdecimal()]
+        produtos_por_id = {
+            produto.id: produto
+            for produto in Product.objects.filter(id__in=ids_validos, usuario=usuario)
+        }
+        
+        # Monta os itens da venda (ainda sem a venda) fora da transação
+        itens = []
+        for produto_id, quantidade, preco in zip(produtos_ids, quantidades, precos):
+            if not produto_id or not quantidade or not preco:
+                continue
             
+            produto = produtos_por_id.get(int(produto_id)) if produto_id.isdecimal() else None
+            if produto is None:
+                continue
+            
+            try:
+                quantidade = int(quantidade)
+                preco = Decimal(preco.replace(',', '.'))
+            except (ValueError, InvalidOperation):
+                continue
+            
+            # Preço negativo, infinito ou NaN não é aceito
+            if quantidade <= 0 or not preco.is_finite() or preco < 0:
+                continue
+            
+            # Preço e subtotal precisam caber nas colunas (max_digits e
+            # decimal_places); senão o INSERT falharia dentro da transação
+            if not _cabe_no_campo(preco, SaleItem, 'preco_unitario'):
+                messages.error(request, f'Preço inválido para o produto "{produto.nome}" (máximo de 8 dígitos inteiros e 2 casas decimais)!')
+                contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
+                return render(request, 'vendas/vendas/form.html', contexto)
+            
+            itens.append(SaleItem(
+                produto=produto,
+                quantidade=quantidade,
+                preco_unitario=preco,
+            ))
+        
+        # O valor total (e cada subtotal) também precisa caber na coluna
+        subtotais = [item.calcular_subtotal() for item in itens]
+        valores_validos = (
+            all(_cabe_no_campo(subtotal, SaleItem, 'subtotal') for subtotal in subtotais)
+            and _cabe_no_campo(sum(subtotais, Decimal(0)), Sale, 'valor_total')
+        )
+        if not valores_validos:
+            messages.error(request, 'Valor total da venda muito alto!')
+            contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
+            return render(request, 'vendas/vendas/form.html', contexto)
+        
+        # Data de vencimento de cada parcela (uma por mês)
+        datas_parcelas = [_somar_meses(data_vencimento_obj, i) for i in range(parcelas)]
+        
+        # Venda, itens e parcelas são gravados juntos em uma única
+        # transação (um único commit; se algo falhar, nada fica pela
+        # metade). Toda a validação e preparação acontece antes, para
+        # a transação ficar aberta o menor tempo possível.
+        with transaction.atomic():
             # Cria a venda
             venda = Sale.objects.create(
                 usuario=usuario,
@@ -1016,80 +1237,19 @@ def venda_create(request):
                 observacoes=observacoes if observacoes else None,
             )
             
-            # Processa os itens da venda
-            produtos_ids = request.POST.getlist('produto_id[]')
-            quantidades = request.POST.getlist('quantidade[]')
-            precos = request.POST.getlist('preco[]')
-            
-            if not produtos_ids:
-                venda.delete()
-                messages.error(request, 'Adicione pelo menos um produto à venda!')
-                contexto = {'clientes': clientes, 'produtos': produtos, 'formas_pagamento': Sale.FORMA_PAGAMENTO_CHOICES}
-                return render(request, 'vendas/vendas/form.html', contexto)
-            
-            # Cria os itens da venda
-            for produto_id, quantidade, preco in zip(produtos_ids, quantidades, precos):
-                if not produto_id or not quantidade or not preco:
-                    continue
-                
-                try:
-                    produto = Product.objects.get(id=produto_id, usuario=usuario)
-                    quantidade = int(quantidade)
-                    preco = float(preco.replace(',', '.'))
-                    
-                    if quantidade <= 0:
-                        continue
-                    
-                    if preco < 0:
-                        continue
-                    
-                    # Cria o item da venda
-                    SaleItem.objects.create(
-                        venda=venda,
-                        produto=produto,
-                        quantidade=quantidade,
-                        preco_unitario=preco,
-                    )
-                
-                except (Product.DoesNotExist, ValueError):
-                    continue
+            # Grava todos os itens em um único INSERT
+            # (o bulk_create do SaleItem calcula o subtotal de cada item)
+            for item in itens:
+                item.venda = venda
+            SaleItem.objects.bulk_create(itens)
             
             # Recalcula o valor total da venda
             venda.calcular_valor_total()
             
-            # Cria as contas a receber (uma por parcela)
+            # Cria as contas a receber (uma por parcela) em um único INSERT
             valor_parcela = venda.valor_total / parcelas
-            
-            for i in range(parcelas):
-                # Calcula a data de vencimento para cada parcela
-                # Adiciona i meses à data de vencimento
-                mes_vencimento = data_vencimento_obj.month + i
-                ano_vencimento = data_vencimento_obj.year
-                
-                # Ajusta o ano se o mês ultrapassar 12
-                while mes_vencimento > 12:
-                    mes_vencimento -= 12
-                    ano_vencimento += 1
-                
-                # Cria a data de vencimento da parcela
-                try:
-                    data_parcela = data_vencimento_obj.replace(
-                        month=mes_vencimento,
-                        year=ano_vencimento
-                    )
-                except ValueError:
-                    # Se o dia não existe no mês (ex: 31 de fevereiro)
-                    # usa o último dia do mês
-                    from calendar import monthrange
-                    ultimo_dia = monthrange(ano_vencimento, mes_vencimento)[1]
-                    data_parcela = data_vencimento_obj.replace(
-                        month=mes_vencimento,
-                        year=ano_vencimento,
-                        day=ultimo_dia
-                    )
-                
-                # Cria a conta a receber
-                AccountsReceivable.objects.create(
+            AccountsReceivable.objects.bulk_create([
+                AccountsReceivable(
                     usuario=usuario,
                     venda=venda,
                     cliente=cliente,
@@ -1097,12 +1257,14 @@ def venda_create(request):
                     data_vencimento=data_parcela,
                     observacoes=f'Parcela {i+1} de {parcelas}' if parcelas > 1 else None,
                 )
-            
-            messages.success(request, f'Venda #{venda.id} criada com sucesso! {parcelas} parcela(s) gerada(s).')
-            return redirect('vendas:venda_detail', pk=venda.pk)
+                for i, data_parcela in enumerate(datas_parcelas)
+            ])
+            # O bulk_create não dispara signals, então o cache do
+            # dashboard é invalidado aqui
+            invalidar_dashboard(usuario.id)
         
-        except Exception as e:
-            messages.error(request, f'Erro ao criar venda: {str(e)}')
+        messages.success(request, f'Venda #{venda.id} criada com sucesso! {parcelas} parcela(s) gerada(s).')
+        return redirect('vendas:venda_detail', pk=venda.pk)
     
     contexto = {
         'clientes': clientes,
@@ -1130,14 +1292,13 @@ def venda_detail(request, pk):
     """
     usuario = request.user
     
-    try:
-        venda = Sale.objects.get(pk=pk, usuario=usuario)
-    except Sale.DoesNotExist:
-        messages.error(request, 'Venda não encontrada!')
-        return redirect('vendas:vendas_list')
+    # O vetor de busca (PostgreSQL) não é exibido
+    venda = get_object_or_404(
+        Sale.objects.select_related('cliente').defer('search_vector'), pk=pk, usuario=usuario
+    )
     
-    # Itens da venda
-    itens = SaleItem.objects.filter(venda=venda)
+    # Itens da venda (com o produto na mesma consulta)
+    itens = SaleItem.objects.filter(venda=venda).select_related('produto')
     
     # Contas a receber (pode haver múltiplas por parcelamento)
     contas_receber = AccountsReceivable.objects.filter(venda=venda).order_by('data_vencimento')
@@ -1166,18 +1327,19 @@ def venda_delete(request, pk):
     """
     usuario = request.user
     
-    try:
-        venda = Sale.objects.get(pk=pk, usuario=usuario)
-    except Sale.DoesNotExist:
-        messages.error(request, 'Venda não encontrada!')
-        return redirect('vendas:vendas_list')
+    vendas = Sale.objects.filter(pk=pk, usuario=usuario)
     
     if request.method == 'POST':
-        venda_id = venda.id
-        venda.delete()
-        messages.success(request, f'Venda #{venda_id} deletada com sucesso!')
+        # Exclui a venda, seus itens e contas com DELETEs diretos, sem
+        # carregar a venda nem disparar o recálculo do total a cada item
+        if not Sale.objects.excluir_em_lote(vendas):
+            raise Http404('Venda não encontrada')
+        messages.success(request, f'Venda #{pk} deletada com sucesso!')
         return redirect('vendas:vendas_list')
     
+    # A confirmação exibe apenas o número da venda
+    venda = get_object_or_404(vendas.only('id'))
+    
     contexto = {
         'venda': venda,
     }
@@ -1188,17 +1350,6 @@ def venda_delete(request, pk):
 # FUNÇÃO: Gerar PDF da Venda
 # =============================================================================
 
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
-from io import BytesIO
-from django.http import HttpResponse
-from datetime import datetime
-
-
 @login_required(login_url='vendas:login')
 def venda_gerar_pdf(request, pk):
     """
@@ -1214,236 +1365,22 @@ def venda_gerar_pdf(request, pk):
     """
     usuario = request.user
     
-    try:
-        venda = Sale.objects.get(pk=pk, usuario=usuario)
-    except Sale.DoesNotExist:
-        messages.error(request, 'Venda não encontrado!')
-        return redirect('vendas:vendas_list')
-    
-    # Itens da venda
-    itens = SaleItem.objects.filter(venda=venda)
-    
-    # Contas a receber
-    contas_receber = AccountsReceivable.objects.filter(venda=venda).order_by('data_vencimento')
-    
-    # Cria o PDF em memória
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    elements = []
-    
-    # Estilos
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=24,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=30,
-        alignment=TA_CENTER,
-        fontName='Helvetica-Bold'
+    # O cliente vem na mesma consulta (JOIN), sem o vetor de busca
+    venda = get_object_or_404(
+        Sale.objects.select_related('cliente').defer('search_vector'), pk=pk, usuario=usuario
     )
     
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=colors.HexColor('#2c3e50'),
-        spaceAfter=10,
-        fontName='Helvetica-Bold'
-    )
+    # O recibo é montado em vendas/pdf.py, sem depender da requisição
+    buffer = gerar_pdf_venda(venda, usuario)
     
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        fontSize=10,
-        spaceAfter=5,
+    # Retorna o PDF lendo direto do buffer (sem copiar os bytes com
+    # getvalue() para uma segunda string)
+    return FileResponse(
+        buffer,
+        as_attachment=True,
+        filename=f'venda_{venda.id}.pdf',
+        content_type='application/pdf',
     )
-    
-    # Título
-    elements.append(Paragraph('RECIBO DE VENDA', title_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    # Informações da empresa (usuário)
-    empresa_info = f"""
-    <b>Vendedor:</b> {usuario.first_name or usuario.username}<br/>
-    <b>Email:</b> {usuario.email}<br/>
-    <b>Data:</b> {venda.data_venda.strftime('%d/%m/%Y %H:%M')}<br/>
-    """
-    elements.append(Paragraph(empresa_info, normal_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    # Informações do cliente
-    elements.append(Paragraph('<b>DADOS DO CLIENTE</b>', heading_style))
-    cliente_info = f"""
-    <b>Nome:</b> {venda.cliente.nome}<br/>
-    <b>Email:</b> {venda.cliente.email or '-'}<br/>
-    <b>Telefone:</b> {venda.cliente.telefone or '-'}<br/>
-    <b>CPF/CNPJ:</b> {venda.cliente.cpf_cnpj or '-'}<br/>
-    <b>Endereço:</b> {venda.cliente.endereco or '-'}<br/>
-    """
-    elements.append(Paragraph(cliente_info, normal_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    # Tabela de produtos
-    elements.append(Paragraph('<b>PRODUTOS</b>', heading_style))
-    
-    # Dados da tabela
-    data = [
-        ['Produto', 'Quantidade', 'Preço Unit.', 'Subtotal']
-    ]
-    
-    for item in itens:
-        data.append([
-            item.produto.nome,
-            str(item.quantidade),
-            f'R$ {item.preco_unitario:.2f}',
-            f'R$ {item.subtotal:.2f}'
-        ])
-    
-    # Adiciona linha de total
-    data.append([
-        '',
-        '',
-        '<b>TOTAL:</b>',
-        f'<b>R$ {venda.valor_total:.2f}</b>'
-    ])
-    
-    # Cria a tabela
-    table = Table(data, colWidths=[3 * inch, 1.2 * inch, 1.2 * inch, 1.2 * inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f8f9fa')]),
-    ]))
-    
-    elements.append(table)
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # Informações de pagamento
-    elements.append(Paragraph('<b>INFORMAÇÕES DE PAGAMENTO</b>', heading_style))
-    pagamento_info = f"""
-    <b>Forma de Pagamento:</b> {venda.get_forma_pagamento_display()}<br/>
-    """
-    
-    if venda.observacoes:
-        pagamento_info += f"<b>Observações:</b> {venda.observacoes}<br/>"
-    
-    elements.append(Paragraph(pagamento_info, normal_style))
-    elements.append(Spacer(1, 0.2 * inch))
-    
-    # Tabela de parcelas
-    if contas_receber.count() > 0:
-        elements.append(Paragraph('<b>PARCELAS</b>', heading_style))
-        
-        parcelas_data = [
-            ['Parcela', 'Valor', 'Vencimento']
-        ]
-        
-        for idx, conta in enumerate(contas_receber, 1):
-            parcelas_data.append([
-                f'Parcela {idx}' if contas_receber.count() > 1 else 'Única',
-                f'R$ {conta.valor:.2f}',
-                conta.data_vencimento.strftime('%d/%m/%Y')
-            ])
-        
-        parcelas_table = Table(parcelas_data, colWidths=[2 * inch, 2 * inch, 2 * inch])
-        parcelas_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f8f9fa')]),
-        ]))
-        
-        elements.append(parcelas_table)
-        elements.append(Spacer(1, 0.3 * inch))
-    
-    # Rodapé
-    rodape = """
-    <i>Este é um recibo de venda. Guarde para sua segurança.<br/>
-    Gerado automaticamente pelo sistema Vendas App</i>
-    """
-    elements.append(Paragraph(rodape, ParagraphStyle(
-        'Rodape',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER,
-    )))
-    
-    # Constrói o PDF
-    doc.build(elements)
-    
-    # Retorna o PDF
-    buffer.seek(0)
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="venda_{venda.id}.pdf"'
-    
-    return response
-    
-    # Cria a tabela
-    table = Table(data, colWidths=[3 * inch, 1.2 * inch, 1.2 * inch, 1.2 * inch])
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#2c3e50')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, -1), (-1, -1), colors.HexColor('#ecf0f1')),
-        ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -2), [colors.white, colors.HexColor('#f8f9fa')]),
-    ]))
-    
-    elements.append(table)
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # Informações de pagamento
-    elements.append(Paragraph('<b>INFORMAÇÕES DE PAGAMENTO</b>', heading_style))
-    pagamento_info = f"""
-    <b>Forma de Pagamento:</b> {venda.get_forma_pagamento_display()}<br/>
-    <b>Data de Vencimento:</b> {venda.data_vencimento.strftime('%d/%m/%Y')}<br/>
-    """
-    
-    if venda.observacoes:
-        pagamento_info += f"<b>Observações:</b> {venda.observacoes}<br/>"
-    
-    elements.append(Paragraph(pagamento_info, normal_style))
-    elements.append(Spacer(1, 0.3 * inch))
-    
-    # Rodapé
-    rodape = """
-    <i>Este é um recibo de venda. Guarde para sua segurança.<br/>
-    Gerado automaticamente pelo sistema Vendas App</i>
-    """
-    elements.append(Paragraph(rodape, ParagraphStyle(
-        'Rodape',
-        parent=styles['Normal'],
-        fontSize=8,
-        textColor=colors.grey,
-        alignment=TA_CENTER,
-    )))
-    
-    # Constrói o PDF
-    doc.build(elements)
-    
-    # Retorna o PDF
-    buffer.seek(0)
-    response = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="venda_{venda.id}.pdf"'
-    
-    return response
 
 # =============================================================================
 # VIEWS: CONTAS A RECEBER
@@ -1457,7 +1394,8 @@ def contas_receber_list(request):
     GET: Retorna a lista de contas a receber
     
     Contexto:
-        - contas_receber: Lista de contas a receber
+        - contas_receber: Página atual de contas a receber
+        - page_obj / filtros_url: Para os links de paginação
         - total_contas: Total de contas
         - valor_total: Valor total a receber
         - status_filtro: Status selecionado
@@ -1466,28 +1404,29 @@ def contas_receber_list(request):
     """
     usuario = request.user
     
-    # Busca todas as contas a receber do usuário
-    contas = AccountsReceivable.objects.filter(usuario=usuario).order_by('-data_vencimento')
+    # Contas do usuário; os filtros abaixo são acumulados em um Q, usado
+    # tanto na listagem quanto nos totais
+    contas_usuario = AccountsReceivable.objects.filter(usuario=usuario)
+    filtro = Q()
     
-    # Atualiza o status de todas as contas
-    hoje = timezone.now().date()
-    for conta in contas:
-        conta.atualizar_status()
+    # Atualiza o status das contas não pagas com dois UPDATEs (em vez de
+    # um save() por conta)
+    AccountsReceivable.atualizar_status_em_lote(usuario)
     
     # Filtro por status
     status = request.GET.get('status', 'pendente')
     if status in ['pendente', 'vencido', 'pago']:
-        contas = contas.filter(status=status)
+        filtro &= Q(status=status)
     elif status == 'todos':
         pass  # Sem filtro
     else:
-        contas = contas.filter(status='pendente')
+        filtro &= Q(status='pendente')
         status = 'pendente'
     
     # Filtro por cliente
     cliente_id = request.GET.get('cliente', '')
     if cliente_id:
-        contas = contas.filter(cliente_id=cliente_id)
+        filtro &= Q(cliente_id=cliente_id)
     
     # Busca por período
     data_inicio = request.GET.get('data_inicio', '')
@@ -1495,32 +1434,53 @@ def contas_receber_list(request):
     
     if data_inicio:
         try:
-            data_inicio_obj = timezone.datetime.strptime(data_inicio, '%Y-%m-%d').date()
-            contas = contas.filter(data_vencimento__gte=data_inicio_obj)
-        except:
+            data_inicio_obj = date.fromisoformat(data_inicio)
+            filtro &= Q(data_vencimento__gte=data_inicio_obj)
+        except ValueError:
             pass
     
     if data_fim:
         try:
-            data_fim_obj = timezone.datetime.strptime(data_fim, '%Y-%m-%d').date()
-            contas = contas.filter(data_vencimento__lte=data_fim_obj)
-        except:
+            data_fim_obj = date.fromisoformat(data_fim)
+            filtro &= Q(data_vencimento__lte=data_fim_obj)
+        except ValueError:
             pass
     
-    # Clientes para filtro
-    clientes = Client.objects.filter(usuario=usuario, ativo=True)
-    
-    # Totais
-    total_contas = contas.count()
-    valor_total = contas.aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    # Resumo por status
-    contas_pendentes = AccountsReceivable.objects.filter(usuario=usuario, status='pendente').aggregate(Sum('valor'))['valor__sum'] or 0
-    contas_vencidas = AccountsReceivable.objects.filter(usuario=usuario, status='vencido').aggregate(Sum('valor'))['valor__sum'] or 0
-    contas_pagas = AccountsReceivable.objects.filter(usuario=usuario, status='pago').aggregate(Sum('valor'))['valor__sum'] or 0
+    # Clientes para filtro (apenas id e nome, em cache por usuário)
+    clientes = clientes_ativos_em_cache(usuario.id)
+    
+    # Totais dos filtros e resumo por status em uma única consulta
+    # (agregação condicional)
+    resumo = contas_usuario.aggregate(
+        total=Count('id', filter=filtro),
+        soma=Sum('valor', filter=filtro),
+        pendentes=Sum('valor', filter=Q(status='pendente')),
+        vencidas=Sum('valor', filter=Q(status='vencido')),
+        pagas=Sum('valor', filter=Q(status='pago')),
+    )
+    total_contas = resumo['total']
+    valor_total = resumo['soma'] or 0
+    contas_pendentes = resumo['pendentes'] or 0
+    contas_vencidas = resumo['vencidas'] or 0
+    contas_pagas = resumo['pagas'] or 0
+    
+    contas = contas_usuario.filter(filtro).order_by('-data_vencimento')
+    
+    # Paginação: busca só a página atual (os totais acima são de todas e
+    # a quantidade já calculada dispensa o COUNT do Paginator), com o
+    # cliente na mesma consulta e apenas as colunas exibidas
+    pagina, filtros_url = _paginar(
+        request,
+        contas.select_related('cliente').only(
+            'id', 'valor', 'data_vencimento', 'status', 'cliente__nome',
+        ),
+        total=total_contas,
+    )
     
     contexto = {
-        'contas_receber': contas,
+        'contas_receber': pagina,
+        'page_obj': pagina,
+        'filtros_url': filtros_url,
         'total_contas': total_contas,
         'valor_total': valor_total,
         'status_filtro': status,
@@ -1555,18 +1515,20 @@ def conta_receber_detail(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsReceivable.objects.get(pk=pk, usuario=usuario)
-    except AccountsReceivable.DoesNotExist:
-        messages.error(request, 'Conta a receber não encontrada!')
-        return redirect('vendas:contas_receber_list')
+    # Venda e cliente vêm na mesma consulta (JOIN)
+    conta = get_object_or_404(
+        AccountsReceivable.objects.select_related('venda', 'cliente').defer('venda__search_vector'),
+        pk=pk, usuario=usuario,
+    )
     
     # Atualiza o status
     conta.atualizar_status()
     
-    # Venda relacionada
+    # Venda relacionada (itens com o nome do produto na mesma consulta)
     venda = conta.venda
-    itens = SaleItem.objects.filter(venda=venda)
+    itens = SaleItem.objects.filter(venda=venda).select_related('produto').only(
+        'quantidade', 'preco_unitario', 'subtotal', 'produto__nome',
+    )
     
     contexto = {
         'conta': conta,
@@ -1592,11 +1554,7 @@ def conta_receber_marcar_pago(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsReceivable.objects.get(pk=pk, usuario=usuario)
-    except AccountsReceivable.DoesNotExist:
-        messages.error(request, 'Conta a receber não encontrada!')
-        return redirect('vendas:contas_receber_list')
+    conta = get_object_or_404(AccountsReceivable, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         data_pagamento = request.POST.get('data_pagamento', '')
@@ -1607,11 +1565,11 @@ def conta_receber_marcar_pago(request, pk):
             return render(request, 'vendas/contas_receber/marcar_pago.html', contexto)
         
         try:
-            data_pagamento_obj = timezone.datetime.strptime(data_pagamento, '%Y-%m-%d').date()
+            data_pagamento_obj = date.fromisoformat(data_pagamento)
             
             conta.data_pagamento = data_pagamento_obj
             conta.status = 'pago'
-            conta.save()
+            conta.save(update_fields=['status', 'data_pagamento'])
             
             messages.success(request, f'Conta #{conta.id} marcada como paga!')
             return redirect('vendas:conta_receber_detail', pk=pk)
@@ -1636,15 +1594,11 @@ def conta_receber_marcar_nao_pago(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsReceivable.objects.get(pk=pk, usuario=usuario)
-    except AccountsReceivable.DoesNotExist:
-        messages.error(request, 'Conta a receber não encontrada!')
-        return redirect('vendas:contas_receber_list')
+    conta = get_object_or_404(AccountsReceivable, pk=pk, usuario=usuario)
     
     conta.data_pagamento = None
     conta.status = 'pendente'
-    conta.save()
+    conta.save(update_fields=['status', 'data_pagamento'])
     
     messages.success(request, f'Conta #{conta.id} marcada como não paga!')
     return redirect('vendas:conta_receber_detail', pk=pk)
@@ -1661,7 +1615,8 @@ def contas_pagar_list(request):
     GET: Retorna a lista de contas a pagar
     
     Contexto:
-        - contas_pagar: Lista de contas a pagar
+        - contas_pagar: Página atual de contas a pagar
+        - page_obj / filtros_url: Para os links de paginação
         - total_contas: Total de contas
         - valor_total: Valor total a pagar
         - status_filtro: Status selecionado
@@ -1670,28 +1625,29 @@ def contas_pagar_list(request):
     """
     usuario = request.user
     
-    # Busca todas as contas a pagar do usuário
-    contas = AccountsPayable.objects.filter(usuario=usuario).order_by('-data_vencimento')
+    # Contas do usuário; os filtros abaixo são acumulados em um Q, usado
+    # tanto na listagem quanto nos totais
+    contas_usuario = AccountsPayable.objects.filter(usuario=usuario)
+    filtro = Q()
     
-    # Atualiza o status de todas as contas
-    hoje = timezone.now().date()
-    for conta in contas:
-        conta.atualizar_status()
+    # Atualiza o status das contas não pagas com dois UPDATEs (em vez de
+    # um save() por conta)
+    AccountsPayable.atualizar_status_em_lote(usuario)
     
     # Filtro por status
     status = request.GET.get('status', 'pendente')
     if status in ['pendente', 'vencido', 'pago']:
-        contas = contas.filter(status=status)
+        filtro &= Q(status=status)
     elif status == 'todos':
         pass  # Sem filtro
     else:
-        contas = contas.filter(status='pendente')
+        filtro &= Q(status='pendente')
         status = 'pendente'
     
     # Busca por descrição
     busca = request.GET.get('busca', '').strip()
     if busca:
-        contas = contas.filter(descricao__icontains=busca)
+        filtro &= Q(descricao__icontains=busca)
     
     # Busca por período
     data_inicio = request.GET.get('data_inicio', '')
@@ -1699,29 +1655,48 @@ def contas_pagar_list(request):
     
     if data_inicio:
         try:
-            data_inicio_obj = timezone.datetime.strptime(data_inicio, '%Y-%m-%d').date()
-            contas = contas.filter(data_vencimento__gte=data_inicio_obj)
-        except:
+            data_inicio_obj = date.fromisoformat(data_inicio)
+            filtro &= Q(data_vencimento__gte=data_inicio_obj)
+        except ValueError:
             pass
     
     if data_fim:
         try:
-            data_fim_obj = timezone.datetime.strptime(data_fim, '%Y-%m-%d').date()
-            contas = contas.filter(data_vencimento__lte=data_fim_obj)
-        except:
+            data_fim_obj = date.fromisoformat(data_fim)
+            filtro &= Q(data_vencimento__lte=data_fim_obj)
+        except ValueError:
             pass
     
-    # Totais
-    total_contas = contas.count()
-    valor_total = contas.aggregate(Sum('valor'))['valor__sum'] or 0
-    
-    # Resumo por status
-    contas_pendentes = AccountsPayable.objects.filter(usuario=usuario, status='pendente').aggregate(Sum('valor'))['valor__sum'] or 0
-    contas_vencidas = AccountsPayable.objects.filter(usuario=usuario, status='vencido').aggregate(Sum('valor'))['valor__sum'] or 0
-    contas_pagas = AccountsPayable.objects.filter(usuario=usuario, status='pago').aggregate(Sum('valor'))['valor__sum'] or 0
+    # Totais dos filtros e resumo por status em uma única consulta
+    # (agregação condicional)
+    resumo = contas_usuario.aggregate(
+        total=Count('id', filter=filtro),
+        soma=Sum('valor', filter=filtro),
+        pendentes=Sum('valor', filter=Q(status='pendente')),
+        vencidas=Sum('valor', filter=Q(status='vencido')),
+        pagas=Sum('valor', filter=Q(status='pago')),
+    )
+    total_contas = resumo['total']
+    valor_total = resumo['soma'] or 0
+    contas_pendentes = resumo['pendentes'] or 0
+    contas_vencidas = resumo['vencidas'] or 0
+    contas_pagas = resumo['pagas'] or 0
+    
+    contas = contas_usuario.filter(filtro).order_by('-data_vencimento')
+    
+    # Paginação: busca só a página atual (os totais acima são de todas e
+    # a quantidade já calculada dispensa o COUNT do Paginator), apenas com
+    # as colunas exibidas
+    pagina, filtros_url = _paginar(
+        request,
+        contas.only('id', 'descricao', 'valor', 'data_vencimento', 'status'),
+        total=total_contas,
+    )
     
     contexto = {
-        'contas_pagar': contas,
+        'contas_pagar': pagina,
+        'page_obj': pagina,
+        'filtros_url': filtros_url,
         'total_contas': total_contas,
         'valor_total': valor_total,
         'status_filtro': status,
@@ -1767,32 +1742,40 @@ def conta_pagar_create(request):
             messages.error(request, 'Data de vencimento é obrigatória!')
             return render(request, 'vendas/contas_pagar/form.html')
         
+        # Converte valores (Decimal direto, sem passar por float)
         try:
-            # Converte valores
-            valor = float(valor.replace(',', '.'))
-            data_vencimento_obj = timezone.datetime.strptime(data_vencimento, '%Y-%m-%d').date()
-            
-            # Valida valores
-            if valor <= 0:
-                messages.error(request, 'Valor deve ser maior que zero!')
-                return render(request, 'vendas/contas_pagar/form.html')
-            
-            # Cria a conta a pagar
-            conta = AccountsPayable.objects.create(
+            valor = Decimal(valor.replace(',', '.'))
+            if not valor.is_finite():
+                raise InvalidOperation
+            data_vencimento_obj = date.fromisoformat(data_vencimento)
+        except (InvalidOperation, ValueError):
+            messages.error(request, 'Valor deve ser um número válido!')
+            return render(request, 'vendas/contas_pagar/form.html')
+        
+        # Valida valores
+        if valor <= 0:
+            messages.error(request, 'Valor deve ser maior que zero!')
+            return render(request, 'vendas/contas_pagar/form.html')
+        
+        # O valor precisa caber na coluna (max_digits e decimal_places);
+        # senão o INSERT falharia com InvalidOperation
+        if not _cabe_no_campo(valor, AccountsPayable, 'valor'):
+            messages.error(request, 'Valor inválido (máximo de 10 dígitos inteiros e 2 casas decimais)!')
+            return render(request, 'vendas/contas_pagar/form.html')
+        
+        # Cria a conta a pagar (o INSERT e as gravações dos signals em uma
+        # única transação)
+        with transaction.atomic():
+            AccountsPayable.objects.create(
                 usuario=usuario,
                 descricao=descricao,
                 valor=valor,
                 data_vencimento=data_vencimento_obj,
                 observacoes=observacoes if observacoes else None,
             )
-            
-            messages.success(request, f'Conta a pagar "{descricao}" criada com sucesso!')
-            return redirect('vendas:contas_pagar_list')
         
-        except ValueError:
-            messages.error(request, 'Valor deve ser um número válido!')
-        except Exception as e:
-            messages.error(request, f'Erro ao criar conta: {str(e)}')
+        messages.success(request, f'Conta a pagar "{descricao}" criada com sucesso!')
+        return redirect('vendas:contas_pagar_list')
     
     return render(request, 'vendas/contas_pagar/form.html')
 
@@ -1812,11 +1795,7 @@ def conta_pagar_edit(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsPayable.objects.get(pk=pk, usuario=usuario)
-    except AccountsPayable.DoesNotExist:
-        messages.error(request, 'Conta a pagar não encontrada!')
-        return redirect('vendas:contas_pagar_list')
+    conta = get_object_or_404(AccountsPayable, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         descricao = request.POST.get('descricao', '').strip()
@@ -1840,31 +1819,41 @@ def conta_pagar_edit(request, pk):
             contexto = {'conta': conta, 'edicao': True}
             return render(request, 'vendas/contas_pagar/form.html', contexto)
         
+        # Converte valores (Decimal direto, sem passar por float)
         try:
-            # Converte valores
-            valor = float(valor.replace(',', '.'))
-            data_vencimento_obj = timezone.datetime.strptime(data_vencimento, '%Y-%m-%d').date()
-            
-            # Valida valores
-            if valor <= 0:
-                messages.error(request, 'Valor deve ser maior que zero!')
-                contexto = {'conta': conta, 'edicao': True}
-                return render(request, 'vendas/contas_pagar/form.html', contexto)
-            
-            # Atualiza a conta
-            conta.descricao = descricao
-            conta.valor = valor
-            conta.data_vencimento = data_vencimento_obj
-            conta.observacoes = observacoes if observacoes else None
-            conta.save()
-            
-            messages.success(request, f'Conta a pagar "{descricao}" atualizada com sucesso!')
-            return redirect('vendas:contas_pagar_list')
-        
-        except ValueError:
+            valor = Decimal(valor.replace(',', '.'))
+            if not valor.is_finite():
+                raise InvalidOperation
+            data_vencimento_obj = date.fromisoformat(data_vencimento)
+        except (InvalidOperation, ValueError):
             messages.error(request, 'Valor deve ser um número válido!')
-        except Exception as e:
-            messages.error(request, f'Erro ao atualizar conta: {str(e)}')
+            contexto = {'conta': conta, 'edicao': True}
+            return render(request, 'vendas/contas_pagar/form.html', contexto)
+        
+        # Valida valores
+        if valor <= 0:
+            messages.error(request, 'Valor deve ser maior que zero!')
+            contexto = {'conta': conta, 'edicao': True}
+            return render(request, 'vendas/contas_pagar/form.html', contexto)
+        
+        # O valor precisa caber na coluna (max_digits e decimal_places);
+        # senão o UPDATE falharia com InvalidOperation
+        if not _cabe_no_campo(valor, AccountsPayable, 'valor'):
+            messages.error(request, 'Valor inválido (máximo de 10 dígitos inteiros e 2 casas decimais)!')
+            contexto = {'conta': conta, 'edicao': True}
+            return render(request, 'vendas/contas_pagar/form.html', contexto)
+        
+        # Atualiza a conta (o UPDATE e as gravações dos signals em uma
+        # única transação)
+        conta.descricao = descricao
+        conta.valor = valor
+        conta.data_vencimento = data_vencimento_obj
+        conta.observacoes = observacoes if observacoes else None
+        with transaction.atomic():
+            conta.save(update_fields=['descricao', 'valor', 'data_vencimento', 'observacoes'])
+        
+        messages.success(request, f'Conta a pagar "{descricao}" atualizada com sucesso!')
+        return redirect('vendas:contas_pagar_list')
     
     contexto = {
         'conta': conta,
@@ -1889,11 +1878,7 @@ def conta_pagar_delete(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsPayable.objects.get(pk=pk, usuario=usuario)
-    except AccountsPayable.DoesNotExist:
-        messages.error(request, 'Conta a pagar não encontrada!')
-        return redirect('vendas:contas_pagar_list')
+    conta = get_object_or_404(AccountsPayable, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         descricao = conta.descricao
@@ -1925,11 +1910,7 @@ def conta_pagar_detail(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsPayable.objects.get(pk=pk, usuario=usuario)
-    except AccountsPayable.DoesNotExist:
-        messages.error(request, 'Conta a pagar não encontrada!')
-        return redirect('vendas:contas_pagar_list')
+    conta = get_object_or_404(AccountsPayable, pk=pk, usuario=usuario)
     
     # Atualiza o status
     conta.atualizar_status()
@@ -1956,11 +1937,7 @@ def conta_pagar_marcar_pago(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsPayable.objects.get(pk=pk, usuario=usuario)
-    except AccountsPayable.DoesNotExist:
-        messages.error(request, 'Conta a pagar não encontrada!')
-        return redirect('vendas:contas_pagar_list')
+    conta = get_object_or_404(AccountsPayable, pk=pk, usuario=usuario)
     
     if request.method == 'POST':
         data_pagamento = request.POST.get('data_pagamento', '')
@@ -1971,11 +1948,11 @@ def conta_pagar_marcar_pago(request, pk):
             return render(request, 'vendas/contas_pagar/marcar_pago.html', contexto)
         
         try:
-            data_pagamento_obj = timezone.datetime.strptime(data_pagamento, '%Y-%m-%d').date()
+            data_pagamento_obj = date.fromisoformat(data_pagamento)
             
             conta.data_pagamento = data_pagamento_obj
             conta.status = 'pago'
-            conta.save()
+            conta.save(update_fields=['status', 'data_pagamento'])
             
             messages.success(request, f'Conta #{conta.id} marcada como paga!')
             return redirect('vendas:conta_pagar_detail', pk=pk)
@@ -2000,15 +1977,11 @@ def conta_pagar_marcar_nao_pago(request, pk):
     """
     usuario = request.user
     
-    try:
-        conta = AccountsPayable.objects.get(pk=pk, usuario=usuario)
-    except AccountsPayable.DoesNotExist:
-        messages.error(request, 'Conta a pagar não encontrada!')
-        return redirect('vendas:contas_pagar_list')
+    conta = get_object_or_404(AccountsPayable, pk=pk, usuario=usuario)
     
     conta.data_pagamento = None
     conta.status = 'pendente'
-    conta.save()
+    conta.save(update_fields=['status', 'data_pagamento'])
     
     messages.success(request, f'Conta #{conta.id} marcada como não paga!')
     return redirect('vendas:conta_pagar_detail', pk=pk)
\ No newline at end of file